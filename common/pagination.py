@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -15,4 +22,56 @@ class DefaultPagination(PageNumberPagination):
                 "pages": self.page.paginator.num_pages,
                 "results": data,
             }
-        )
\ No newline at end of file
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    ``Paginator`` whose ``COUNT(*)`` is shared through the Django cache.
+
+    The count is keyed by the SQL of the unsliced queryset and kept for
+    ``PAGINATION_COUNT_CACHE_TTL`` seconds, so paging through a list costs
+    one COUNT per TTL instead of one per page. Counts may lag writes by up
+    to the TTL; an overshooting last page is simply empty.
+    """
+
+    @cached_property
+    def count(self):
+        try:
+            sql = str(self.object_list.query)
+        except (AttributeError, EmptyResultSet):
+            # Not a queryset, or one that can never match (e.g. ``.none()``).
+            return super().count
+        digest = hashlib.sha1(sql.encode(), usedforsecurity=False).hexdigest()
+        return cache.get_or_set(
+            f"pagination:count:{digest}",
+            self.object_list.count,
+            settings.PAGINATION_COUNT_CACHE_TTL,
+        )
+
+
+class CachedCountPagination(DefaultPagination):
+    """``DefaultPagination`` with the page count served from cache."""
+
+    django_paginator_class = CachedCountPaginator
+
+
+class HistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for append-only history, newest first.
+
+    Each page is an index range scan from the cursor position, so its cost
+    does not grow with how far back the client has paged (unlike OFFSET).
+    ``id`` breaks ties between rows sharing a ``created_at``.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class ChatMessageCursorPagination(HistoryCursorPagination):
+    """Keyset pagination for the messages of one chat, oldest first."""
+
+    ordering = ("created_at", "id")
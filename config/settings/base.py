@@ -107,6 +107,11 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "ragpassword"),
         "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        # Keep connections open across requests: saves the connect/auth round
+        # trips per request and keeps the per-connection prepared retrieval
+        # statement alive.  Health checks drop connections the server closed.
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", "300")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -129,6 +134,14 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2id (argon2-cffi's C implementation) for new hashes; the PBKDF2
+# hashers stay listed so existing hashes verify and are upgraded on login.
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
 AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
@@ -250,6 +263,9 @@ CACHES = {
     },
 }
 
+USER_LIST_CACHE_TTL = 30  # Seconds a user's user-list page is served from Redis
+PAGINATION_COUNT_CACHE_TTL = 30  # Seconds a paginated list's COUNT(*) is reused
+
 # Tell Django to use Redis for sessions
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'sessions'
@@ -288,6 +304,22 @@ LLM_DEFAULT_MODEL = "Qwen/Qwen2-0.5B-Instruct"
 SIMILARITY_THRESHOLD = 0.45  # Tune this value for your data
 TOP_K = 3 # Number of top similar chunks to retrieve
 RAG_MAX_CONTEXT_LENGTH = 3000  # Max tokens for retrieved context (tune based on your LLM's limits)
+RAG_HNSW_EF_SEARCH = 40  # HNSW candidate list size per retrieval (recall vs. speed)
+RAG_RETRIEVAL_WORK_MEM = "64MB"  # Per-retrieval sort/hash memory before spilling to disk
+RAG_RETRIEVAL_STATEMENT_TIMEOUT_MS = 2000  # Abort slow retrieval plans (→ NO_RESULTS)
+RAG_EMBED_CACHE_SIZE = 1024  # In-process LRU entries for query embeddings
+RAG_EMBED_CACHE_TTL = 60 * 60 * 24  # Seconds a query embedding stays in Redis
+RAG_SEMANTIC_CACHE_SIZE = 10_000  # Per-process cached responses for near-duplicate queries; 0 disables
+RAG_SEMANTIC_CACHE_TTL = 300  # Seconds a cached response may be served
+RAG_SEMANTIC_CACHE_THRESHOLD = 0.95  # Min cosine similarity to reuse a cached response
+RAG_EMBED_BATCH_MAX_SIZE = 64  # Max concurrent query texts embedded in one forward pass
+RAG_EMBED_BATCH_WAIT_MS = 8  # Max wait for more queries once a batch has one
+RAG_EMBED_BATCH_CONCURRENCY = 2  # Query-embedding batches in flight at once
+RAG_RETRIEVE_BATCH_MAX_SIZE = 32  # Max concurrent query vectors retrieved per drain cycle
+RAG_RETRIEVE_BATCH_WAIT_MS = 5  # Max wait for more vectors once a batch has one
+RAG_RETRIEVE_BATCH_CONCURRENCY = 2  # Retrieval batches (and DB connections) in flight
+RAG_CHAT_WARM_TTL = 15 * 60  # Seconds a new chat's prefetched follow-up retrievals live in Redis
+RAG_CHAT_WARM_THRESHOLD = 0.9  # Min cosine similarity to reuse a prefetched retrieval
 
 # Tuning parameters for the text-generation pipeline
 LLM_INFERENCE_PARAMS = {
@@ -298,10 +330,16 @@ LLM_INFERENCE_PARAMS = {
     "repetition_penalty": 1.1,
 }
 
+# Max (model, max_tokens, query, context) answers memoised by LLMService; 0 disables
+LLM_ANSWER_CACHE_SIZE = 512
+
 # --- Embedding Service Tuning ---
 # HuggingFace model identifier
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Output dimension of EMBEDDING_MODEL_NAME; must match DocumentChunk.embedding
+EMBEDDING_DIM = 384
+
 # Absolute path for ONNX cache. 
 # Using a subfolder of BASE_DIR or a dedicated volume path
 EMBEDDING_ONNX_CACHE_DIR = "/app/models/onnx/all-MiniLM-L6-v2"
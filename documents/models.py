@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from pgvector.django import VectorField 
+from pgvector.django import HnswIndex, VectorField
 
 
 class Document(models.Model):
@@ -85,6 +85,14 @@ class DocumentChunk(models.Model):
             models.Index(fields=["document", "chunk_index"]),
             # Add composite index for common queries
             models.Index(fields=["security_level", "document"]),
+            # ANN index for cosine-distance retrieval (ORDER BY embedding <=> q)
+            HnswIndex(
+                name="documentchunk_embedding_hnsw",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
         ]
         # Add unique constraint to prevent duplicate chunks
         unique_together = ['document', 'chunk_index']
@@ -1,11 +1,16 @@
 from rest_framework import permissions
 
+from users.models import User
+
+# Role sets checked on every upload / delete request.
+_DELETE_ROLES = frozenset({User.Role.CEO.value, User.Role.VICE_PRESIDENT.value})
+
 class CanUploadPermission(permissions.BasePermission):
     """Only EMPLOYEE and above can upload documents."""
     message = "Only employees and above can upload documents."
 
     def has_permission(self, request, view):
-        return request.user.role not in ["GUEST"]
+        return request.user.role != User.Role.GUEST.value
     
 class CanDeletePermission(permissions.BasePermission):
     """Only CEO and VICE_PRESIDENT can delete documents."""
@@ -14,4 +19,4 @@ class CanDeletePermission(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user.role in ["CEO", "VICE_PRESIDENT"]
\ No newline at end of file
+        return request.user.role in _DELETE_ROLES
\ No newline at end of file
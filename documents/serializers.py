@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from users.serializers import RoleField
 from .models import Document
 
 
 class DocumentSerializer(serializers.ModelSerializer):
     uploaded_by_email = serializers.ReadOnlyField(source="uploaded_by.email")
-    uploaded_by_role  = serializers.ReadOnlyField(source="uploaded_by.role")
+    uploaded_by_role  = RoleField(source="uploaded_by.role", read_only=True)
 
     class Meta:
         model  = Document
@@ -7,7 +7,7 @@
  *   GET    /rag/chats/                     → list sessions
  *   POST   /rag/chats/                     → create session
  *   DELETE /rag/chats/<id>/                → soft-delete session
- *   GET    /rag/chats/<id>/messages/       → get messages in session
+ *   GET    /rag/chats/<id>/messages/       → get messages in session (cursor-paged)
  *   POST   /rag/chats/<id>/message/        → send message (RAG query)
  */
 
@@ -43,6 +43,13 @@ export interface ChatMessage {
   sources:         Source[];
 }
 
+/** DRF cursor pagination envelope — no total count, just neighbour links. */
+export interface CursorPage<T> {
+  next:     string | null;
+  previous: string | null;
+  results:  T[];
+}
+
 export interface SendMessageResponse {
   success:     boolean;
   query_id:    number;
@@ -71,9 +78,24 @@ export const chatApi = {
   deleteSession: (id: number) =>
     api.delete(`/rag/v1/chats/${id}/`),
 
-  /** Fetch all messages for a session (paginated, oldest-first) */
-  getMessages: (chatId: number) =>
-    api.get<{ results: ChatMessage[]; count: number }>(`/rag/v1/chats/${chatId}/messages/`),
+  /** Fetch all messages for a session, oldest-first, following every cursor page */
+  getMessages: async (chatId: number): Promise<ChatMessage[]> => {
+    const messages: ChatMessage[] = [];
+    let cursor: string | null = null;
+    do {
+      const { data }: { data: CursorPage<ChatMessage> } = await api.get(
+        `/rag/v1/chats/${chatId}/messages/`,
+        { params: { page_size: 100, ...(cursor ? { cursor } : {}) } },
+      );
+      messages.push(...data.results);
+      // `next` is an absolute URL; keep requests relative (proxy/baseURL)
+      // and only carry its opaque cursor over.
+      cursor = data.next
+        ? new URL(data.next, window.location.origin).searchParams.get('cursor')
+        : null;
+    } while (cursor);
+    return messages;
+  },
 
   /** Send a user message and receive the RAG response */
   sendMessage: (chatId: number, query: string, mode: 'quick' | 'detailed' = 'quick') =>
@@ -254,9 +254,8 @@ export default function Dashboard() {
     setMessages([]);
     setMessagesLoading(true);
     try {
-      const { data } = await chatApi.getMessages(session.id);
-      const msgs: Message[] = ((data as any).results ?? data)
-        .flatMap((m: ChatMessage) => fromChatMessage(m));
+      const history = await chatApi.getMessages(session.id);
+      const msgs: Message[] = history.flatMap((m: ChatMessage) => fromChatMessage(m));
       setMessages(msgs);
     } catch { /* silent */ }
     finally { setMessagesLoading(false); }
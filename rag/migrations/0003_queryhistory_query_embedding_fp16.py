@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-15 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rag", "0002_chat_queryhistory_chat"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="queryhistory",
+            name="query_embedding",
+            field=models.JSONField(
+                blank=True,
+                help_text="Legacy fp32 query embedding (JSON); new rows use query_embedding_fp16",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="queryhistory",
+            name="query_embedding_fp16",
+            field=models.BinaryField(
+                blank=True,
+                help_text="384-dimensional query embedding as little-endian float16 bytes",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-15 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rag", "0003_queryhistory_query_embedding_fp16"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="queryhistory",
+            name="response_source",
+            field=models.CharField(
+                choices=[
+                    ("LLM", "Generated by Local LLM"),
+                    ("EXTRACTIVE", "Extractive summary (fallback)"),
+                    ("ERROR", "Error response"),
+                    ("SEMANTIC_CACHE", "Served from the semantic response cache"),
+                ],
+                default="LLM",
+                max_length=20,
+            ),
+        ),
+    ]
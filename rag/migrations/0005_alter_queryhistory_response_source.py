@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-15 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rag", "0004_alter_queryhistory_response_source"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="queryhistory",
+            name="response_source",
+            field=models.CharField(
+                choices=[
+                    ("LLM", "Generated by Local LLM"),
+                    ("EXTRACTIVE", "Extractive summary (fallback)"),
+                    ("ERROR", "Error response"),
+                    ("SEMANTIC_CACHE", "Served from the semantic response cache"),
+                    ("COALESCED", "Shared from a concurrent identical query"),
+                ],
+                default="LLM",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-15 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rag", "0005_alter_queryhistory_response_source"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="queryhistory",
+            name="rag_queryhi_user_id_7cfaad_idx",
+        ),
+        migrations.AddIndex(
+            model_name="queryhistory",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="queryhistory_user_created_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="queryhistory",
+            index=models.Index(
+                fields=["chat", "created_at", "id"],
+                name="queryhistory_chat_created_id",
+            ),
+        ),
+    ]
@@ -29,7 +29,15 @@ class QueryHistory(models.Model):
     query_embedding = models.JSONField(
         null=True, 
         blank=True,
-        help_text="384-dimensional query embedding for reproducibility"
+        help_text=(
+            "Legacy fp32 query embedding (JSON); "
+            "new rows use query_embedding_fp16"
+        ),
+    )
+    query_embedding_fp16 = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="384-dimensional query embedding as little-endian float16 bytes"
     )
     
     # Retrieved context
@@ -47,6 +55,8 @@ class QueryHistory(models.Model):
             ("LLM", "Generated by Local LLM"),
             ("EXTRACTIVE", "Extractive summary (fallback)"),
             ("ERROR", "Error response"),
+            ("SEMANTIC_CACHE", "Served from the semantic response cache"),
+            ("COALESCED", "Shared from a concurrent identical query"),
         ],
         default="LLM"
     )
@@ -73,10 +83,18 @@ class QueryHistory(models.Model):
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["user", "-created_at"]),
+            # Keyset pagination walks these in (created_at, id) order.
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="queryhistory_user_created_id",
+            ),
+            models.Index(
+                fields=["chat", "created_at", "id"],
+                name="queryhistory_chat_created_id",
+            ),
             models.Index(fields=["security_level", "-created_at"]),
             models.Index(fields=["is_flagged"]),
         ]
     
     def __str__(self):
-        return f"Query by {self.user.username if self.user else 'Anonymous'} at {self.created_at}"
\ No newline at end of file
+        return f"Query by {self.user.email if self.user else 'Anonymous'} at {self.created_at}"
\ No newline at end of file
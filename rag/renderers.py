@@ -0,0 +1,25 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for ``text/event-stream`` (server-sent events) clients.
+
+    Streaming views return a ``StreamingHttpResponse`` directly; this renderer
+    lets DRF's content negotiation accept the media type and formats any
+    regular ``Response`` (e.g. a validation error) as a single SSE event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return format_event(data).encode(self.charset)
+
+
+def format_event(data) -> str:
+    """Serialise *data* as one SSE ``data:`` event."""
+    return f"data: {json.dumps(data)}\n\n"
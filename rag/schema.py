@@ -0,0 +1,71 @@
+"""
+OpenAPI (drf-spectacular) schema declarations for the RAG endpoints.
+
+Kept out of ``views.py`` so the view module stays readable; views apply
+them with ``@extend_schema(**QUERY_POST_SCHEMA)``.
+"""
+
+from drf_spectacular.utils import OpenApiExample, OpenApiResponse
+
+QUERY_POST_SCHEMA = {
+    "summary": "Submit a RAG query",
+    "description": (
+        "Embeds the query, retrieves relevant document chunks within the "
+        "user's security clearance, and returns a generated answer. "
+        "Use `mode=quick` (default) for the smaller, faster model or "
+        "`mode=detailed` for the larger, more thorough model."
+    ),
+    "responses": {
+        200: OpenApiResponse(
+            description="Query processed successfully (answer may be extractive if LLM unavailable).",
+            examples=[
+                OpenApiExample(
+                    "LLM answer",
+                    value={
+                        "success": True,
+                        "query_id": 42,
+                        "answer": "The Q3 revenue was $4.2 million.",
+                        "source": "LLM",
+                        "model": "Qwen/Qwen2-0.5B-Instruct",
+                        "chunks_used": 3,
+                        "latency_ms": 812,
+                        "token_count": 11,
+                        "sources": [
+                            {
+                                "chunk_id": 7,
+                                "document_id": 2,
+                                "document_title": "Q3 Financial Report",
+                                "chunk_index": 4,
+                            }
+                        ],
+                    },
+                ),
+                OpenApiExample(
+                    "No results",
+                    value={
+                        "success": True,
+                        "query_id": 43,
+                        "answer": "I could not find any relevant information to answer your question.",
+                        "source": "NO_RESULTS",
+                        "model": None,
+                        "chunks_used": 0,
+                        "latency_ms": 54,
+                        "sources": [],
+                    },
+                ),
+            ],
+        ),
+        400: OpenApiResponse(description="Invalid request body (validation error)."),
+        401: OpenApiResponse(description="Authentication credentials not provided."),
+        500: OpenApiResponse(
+            description="Unexpected server error.",
+            examples=[
+                OpenApiExample(
+                    "Internal error",
+                    value={"error": "Internal server error", "details": "..."},
+                )
+            ],
+        ),
+    },
+    "tags": ["RAG"],
+}
@@ -1,14 +1,52 @@
+import re
+from collections.abc import Mapping
+from typing import Optional, Tuple
+
+from django.conf import settings
 from rest_framework import serializers
 from rag.models import Chat, QueryHistory
 
+QUERY_MAX_LENGTH = 2000
+
+# Characters DRF's CharField rejects (ProhibitNullCharactersValidator /
+# ProhibitSurrogateCharactersValidator); Postgres cannot store either.
+_PROHIBITED_CHARS_RE = re.compile("[\x00\ud800-\udfff]")
+
+
+def fast_validate_query(data) -> Optional[Tuple[str, str]]:
+    """
+    Hand-rolled fast path for ``QueryRequestSerializer``.
+
+    Accepts a subset of what the serializer accepts — a mapping body with a
+    string query free of NUL / surrogate characters and an optional known
+    string mode — and returns the same cleaned ``(query, mode)``.  Returns
+    ``None`` for anything else, in which case the caller runs the serializer
+    to get its detailed errors.
+    """
+    if not isinstance(data, Mapping):
+        return None
+    query = data.get("query")
+    mode = data.get("mode", "quick")
+    if not isinstance(query, str) or not isinstance(mode, str):
+        return None
+    if mode not in settings.RESPONSE_MODE_MODELS:
+        return None
+    query = query.strip()
+    if not query or len(query) > QUERY_MAX_LENGTH:
+        return None
+    if _PROHIBITED_CHARS_RE.search(query):
+        return None
+    return query, mode
+
+
 class QueryRequestSerializer(serializers.Serializer):
     query = serializers.CharField(
         required=True,
-        max_length=2000,
+        max_length=QUERY_MAX_LENGTH,
         help_text="Natural language query",
     )
     mode = serializers.ChoiceField(
-        choices=["quick", "detailed"],
+        choices=list(settings.RESPONSE_MODE_MODELS),
         required=False,
         default="quick",
         help_text="'quick' uses a smaller/faster model, 'detailed' uses a larger/slower model",
@@ -21,7 +59,7 @@ class ChatSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "is_deleted", "created_at", "updated_at"]
 
 class QueryHistorySerializer(serializers.ModelSerializer):
-    username = serializers.CharField(source="user.username", read_only=True)
+    username = serializers.CharField(source="user.email", read_only=True)
     sources = serializers.SerializerMethodField()
 
     class Meta:
@@ -29,45 +29,34 @@ Usage
 """
 
 import logging
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from documents.models import Document
 
 logger = logging.getLogger(__name__)
 
+# Fail-safe level and its access set, hoisted out of the per-call fallbacks.
+_DEFAULT_LEVEL = Document.SecurityLevel.LOW
+_DEFAULT_ACCESS = (_DEFAULT_LEVEL,)
 
-def get_user_allowed_security_levels(user) -> Tuple[List[str], str]:
-    """
-    Derive the set of security levels a user is permitted to access.
 
-    The function imports ``User`` lazily to avoid circular import issues
-    at module load time (``users`` depends on ``documents``; importing at the
-    top level would create a cycle).
+@lru_cache(maxsize=1)
+def _access_tables() -> Tuple[Dict[str, str], Dict[str, Tuple[str, ...]]]:
+    """
+    Build the role → max level and level → allowed levels lookup tables.
 
-    Args:
-        user: A Django ``User`` instance, or ``None`` for unauthenticated
-              requests.
+    Built once on first use rather than per call; deferred until then so the
+    ``User`` import below happens after app loading.
 
     Returns:
-        A ``(allowed_levels, effective_max_level)`` tuple where:
-
-        * ``allowed_levels``    is a list of ``Document.SecurityLevel`` values
-                                the user may query.
-        * ``effective_max_level`` is the single highest level in that list,
-                                  useful for tagging ``QueryHistory`` records.
-
-    Examples:
-        >>> allowed, max_level = get_user_allowed_security_levels(None)
-        >>> allowed
-        ['LOW']
-        >>> max_level
-        'LOW'
+        ``(ROLE_TO_MAX_LEVEL, SECURITY_LEVEL_ACCESS)``
     """
     # Lazy import to break the documents ↔ users circular dependency.
     from users.models import User
 
     # Maps each role to the highest security level the role may access.
-    ROLE_TO_MAX_LEVEL = {
+    role_to_max_level = {
         User.Role.GUEST:          Document.SecurityLevel.LOW,
         User.Role.EMPLOYEE:       Document.SecurityLevel.MID,
         User.Role.MANAGER:        Document.SecurityLevel.HIGH,
@@ -76,33 +65,67 @@ def get_user_allowed_security_levels(user) -> Tuple[List[str], str]:
     }
 
     # Cumulative access: a user at level X can see everything at or below X.
-    SECURITY_LEVEL_ACCESS = {
-        Document.SecurityLevel.LOW: [
+    # Tuples, because the same objects are handed to every caller.
+    security_level_access = {
+        Document.SecurityLevel.LOW: (
             Document.SecurityLevel.LOW,
-        ],
-        Document.SecurityLevel.MID: [
+        ),
+        Document.SecurityLevel.MID: (
             Document.SecurityLevel.LOW,
             Document.SecurityLevel.MID,
-        ],
-        Document.SecurityLevel.HIGH: [
+        ),
+        Document.SecurityLevel.HIGH: (
             Document.SecurityLevel.LOW,
             Document.SecurityLevel.MID,
             Document.SecurityLevel.HIGH,
-        ],
-        Document.SecurityLevel.VERY_HIGH: [
+        ),
+        Document.SecurityLevel.VERY_HIGH: (
             Document.SecurityLevel.LOW,
             Document.SecurityLevel.MID,
             Document.SecurityLevel.HIGH,
             Document.SecurityLevel.VERY_HIGH,
-        ],
+        ),
     }
+    return role_to_max_level, security_level_access
+
+
+def get_user_allowed_security_levels(user) -> Tuple[List[str], str]:
+    """
+    Derive the set of security levels a user is permitted to access.
+
+    Pure in-memory lookup on ``user.role`` — no database access.  The
+    lookup tables are built once by ``_access_tables``, which imports
+    ``User`` lazily to avoid circular import issues at module load time
+    (``users`` depends on ``documents``; importing at the top level would
+    create a cycle).
+
+    Args:
+        user: A Django ``User`` instance, or ``None`` for unauthenticated
+              requests.
+
+    Returns:
+        A ``(allowed_levels, effective_max_level)`` tuple where:
+
+        * ``allowed_levels``    is a list of ``Document.SecurityLevel`` values
+                                the user may query.
+        * ``effective_max_level`` is the single highest level in that list,
+                                  useful for tagging ``QueryHistory`` records.
+
+    Examples:
+        >>> allowed, max_level = get_user_allowed_security_levels(None)
+        >>> allowed
+        ['LOW']
+        >>> max_level
+        'LOW'
+    """
+    role_to_max_level, security_level_access = _access_tables()
 
     # Unauthenticated users get the minimum access level.
     if user is None:
         logger.debug("Unauthenticated user — granting LOW access only.")
-        return [Document.SecurityLevel.LOW], Document.SecurityLevel.LOW
+        return list(_DEFAULT_ACCESS), _DEFAULT_LEVEL
 
-    effective_max = ROLE_TO_MAX_LEVEL.get(user.role)
+    effective_max = role_to_max_level.get(user.role)
 
     if effective_max is None:
         # Unknown role — fail safe to the lowest level rather than raising.
@@ -110,9 +133,9 @@ def get_user_allowed_security_levels(user) -> Tuple[List[str], str]:
             "Unknown user role — defaulting to LOW security access.",
             extra={"user_id": user.id, "role": user.role},
         )
-        effective_max = Document.SecurityLevel.LOW
+        effective_max = _DEFAULT_LEVEL
 
-    allowed_levels = SECURITY_LEVEL_ACCESS.get(effective_max, [Document.SecurityLevel.LOW])
+    allowed_levels = list(security_level_access.get(effective_max, _DEFAULT_ACCESS))
 
     logger.debug(
         "Security levels resolved for user.",
@@ -0,0 +1,59 @@
+"""
+Dynamic micro-batching of query embeddings across concurrent requests.
+
+A single-string ``embed_batch`` call pays the full per-call overhead of the
+ONNX session for one row; the same call with many rows costs little more.
+``EmbeddingBatcher`` gathers the strings submitted by concurrent request
+threads (see ``MicroBatcher`` for the batching window) and embeds them in
+one forward pass.  Texts are sorted by length first so similarly sized
+strings share a padded batch; results are scattered back in caller order.
+"""
+
+from typing import List
+
+from django.conf import settings
+
+from documents.services.embedding import embedding_service
+from rag.services.micro_batcher import MicroBatcher
+
+
+class EmbeddingBatcher(MicroBatcher):
+    """
+    Coalesce concurrent ``embed`` calls into shared ``embed_batch`` calls.
+
+    Args:
+        max_batch:   Maximum texts per forward pass.
+        max_wait_ms: Longest a batch waits for more texts once it has one.
+        concurrency: Number of batches that may be embedded at once.
+    """
+
+    name = "embedding-batcher"
+
+    def __init__(
+        self,
+        max_batch: int = settings.RAG_EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = settings.RAG_EMBED_BATCH_WAIT_MS,
+        concurrency: int = settings.RAG_EMBED_BATCH_CONCURRENCY,
+    ) -> None:
+        super().__init__(max_batch, max_wait_ms, concurrency)
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed *text* as part of the next batch and wait for its vector.
+
+        Raises:
+            Exception: Propagated from ``embedding_service.embed_batch``.
+        """
+        return self.submit(text)
+
+    def _process(self, texts: List[str]) -> List[List[float]]:
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = embedding_service.embed_batch([texts[i] for i in order])
+        results: List[List[float]] = [None] * len(texts)
+        for i, vector in zip(order, vectors):
+            results[i] = vector
+        return results
+
+
+# Module-level singleton — import this in views / services.
+embedding_batcher = EmbeddingBatcher()
@@ -0,0 +1,83 @@
+"""
+Request-level single-flight for identical in-flight RAG queries.
+
+When several users submit the same question at the same time (a trending
+query, a shared dashboard prompt), only the first request runs the pipeline;
+the others block on its ``Future`` and reuse the result.  This collapses the
+thundering-herd window before the semantic cache has been populated.
+
+Keys combine the normalised query (lower-cased, whitespace collapsed), the
+caller's security scope and the model name, so results are never shared
+across ACL boundaries or models.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class InflightRequests:
+    """Thread-safe registry of pipeline runs currently in progress."""
+
+    def __init__(self) -> None:
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query_text: str, scope: str, model_name: str) -> str:
+        """
+        Build the coalescing key for a request.
+
+        Args:
+            query_text: Raw query; "What is X?" and "what  is x?" share a key.
+            scope:      Security scope of the caller (effective max level).
+            model_name: Model that will generate the answer.
+        """
+        normalized = " ".join(query_text.lower().split())
+        raw = f"{normalized}|{scope}|{model_name}"
+        return hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()
+
+    def run(self, key: str, fn: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        Run *fn* once per concurrent *key* and share its result.
+
+        Args:
+            key: Coalescing key from ``make_key``.
+            fn:  Zero-argument callable running the pipeline.
+
+        Returns:
+            ``(result, is_leader)`` — ``is_leader`` is ``False`` when the
+            result was produced by another, concurrent request.
+
+        Raises:
+            Exception: Whatever *fn* raised, re-raised in every waiter.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+
+        if not leader:
+            logger.debug("Coalesced in-flight RAG query.", extra={"key": key})
+            return future.result(), False
+
+        try:
+            result = fn()
+            future.set_result(result)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+        return result, True
+
+
+# Module-level singleton — import this in views / services.
+inflight = InflightRequests()
@@ -5,10 +5,10 @@ Model registry
 --------------
 Models are configured in settings.py RESPONSE_MODE_MODELS.
 
-Models are kept in three parallel class-level registries (tokenizer, model,
-pipeline) and lazily loaded on first use.  Call ``load_all_models()`` at
-Django app startup (e.g. in ``AppConfig.ready()``) to pay the cold-start cost
-once rather than on the first user request.
+Models are kept in parallel class-level registries (tokenizer, model,
+pipeline, generation config) and lazily loaded on first use.  Call
+``load_all_models()`` at Django app startup (e.g. in ``AppConfig.ready()``)
+to pay the cold-start cost once rather than on the first user request.
 
 Fallback strategy
 -----------------
@@ -17,26 +17,90 @@ fails, it falls back to a simple extractive heuristic that returns the first
 few sentences of the retrieved context.  The returned ``bool`` flag tells the
 caller which path was taken (``True`` = LLM, ``False`` = extractive).
 
+Answer cache
+------------
+Successful LLM answers are memoised in a bounded LRU keyed by
+``(model_name, max_tokens, digest(query), digest(context))`` so retries and
+evaluator loops that repeat the same inputs skip inference entirely.
+Extractive fallbacks are never cached.  ``cache_clear()`` empties it.
+
+Streaming
+---------
+``iter_answer`` (sync) and ``stream_answer`` (async) yield text fragments as
+the model decodes them, so callers (e.g. a ``StreamingHttpResponse``) can
+show the first tokens after prefill instead of waiting for the full answer.
+Only ``iter_answer`` is wired up (``RAGQueryService.stream_events`` → the
+chat SSE response); ``stream_answer`` has no caller under gunicorn WSGI.
+``model.generate`` runs in a background thread feeding a
+``TextIteratorStreamer``; the same extractive fallback applies when the LLM
+is unavailable.
+
 Thread safety
 -------------
-The ``_model is not None`` guard in ``load_model`` is not atomically safe
-under concurrent Django workers.  In multi-threaded environments two threads
-may race through the check and both attempt to download/load the model.  The
-outcome is harmless (the second write overwrites the first with an identical
-object) but wastes memory during the race window.  Add a ``threading.Lock``
-per model key if strict single-init is required.
+``load_model`` uses double-checked locking.  The fast path is a lock-free
+registry lookup; on a miss the caller takes a per-model ``threading.Lock``
+and re-checks before loading, so concurrent threads never download or
+materialise the same multi-GB weights twice.  The pipeline registry entry is
+written last, which makes it the "fully loaded" flag for the fast path.
 """
 
+import asyncio
+import contextlib
+import hashlib
 import logging
+import threading
 import time
-from typing import Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional, Tuple
 
 import torch
 from django.conf import settings
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    TextIteratorStreamer,
+    pipeline,
+)
 
 logger = logging.getLogger(__name__)
 
+# Initial prefix window scanned by the extractive fallback; doubled until
+# three sentences are found or the context is exhausted.
+EXTRACTIVE_PREFIX_LIMIT = 4096
+_NEWLINE_TO_SPACE = str.maketrans("\n", " ")
+
+
+@dataclass(frozen=True)
+class _GenCfg:
+    """
+    Per-model generation kwargs snapshotted at load time.
+
+    Saves the tokenizer attribute reads and ``INFERENCE_PARAMS`` lookups that
+    would otherwise be repeated on every generation call.
+    """
+
+    eos_id: int
+    pad_id: int
+    temperature: float
+    top_p: float
+    do_sample: bool
+    repetition_penalty: float
+    # True when generate() reuses a pre-allocated StaticCache (GPU only);
+    # such models must not run two generations concurrently.
+    static_cache: bool = False
+
+    def as_kwargs(self) -> dict:
+        """Return the sampling kwargs accepted by ``generate`` / ``pipeline``."""
+        return {
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "do_sample": self.do_sample,
+            "repetition_penalty": self.repetition_penalty,
+            "eos_token_id": self.eos_id,
+            "pad_token_id": self.pad_id,
+        }
+
 
 class LLMService:
     """
@@ -52,12 +116,27 @@ class LLMService:
     MODEL_REGISTRY = {model: None for model in settings.RESPONSE_MODE_MODELS.values()}
     TOKENIZER_REGISTRY = {model: None for model in settings.RESPONSE_MODE_MODELS.values()}
     PIPELINE_REGISTRY = {model: None for model in settings.RESPONSE_MODE_MODELS.values()}
+    GEN_CFG_REGISTRY = {model: None for model in settings.RESPONSE_MODE_MODELS.values()}
 
     DEFAULT_MODEL = settings.LLM_DEFAULT_MODEL
 
     # Inference parameters from settings
     INFERENCE_PARAMS = settings.LLM_INFERENCE_PARAMS
 
+    # Per-model load locks; ``_LOCKS_LOCK`` guards creation of new entries.
+    _LOCKS = {}
+    _LOCKS_LOCK = threading.Lock()
+
+    # LRU of successful LLM answers; see "Answer cache" in the module docstring.
+    ANSWER_CACHE_SIZE = settings.LLM_ANSWER_CACHE_SIZE
+    _ANSWER_CACHE = OrderedDict()
+    _ANSWER_CACHE_LOCK = threading.Lock()
+
+    # Serialise generate() on models sharing a single static KV cache.
+    _GENERATE_LOCKS = {
+        model: threading.Lock() for model in settings.RESPONSE_MODE_MODELS.values()
+    }
+
     # ──────────────────────────────────────────────────────────────────────────
     # Model lifecycle
     # ──────────────────────────────────────────────────────────────────────────
@@ -87,10 +166,47 @@ class LLMService:
             )
             model_name = self.DEFAULT_MODEL
 
+        # Fast path: no lock once the model is loaded.
         if self.PIPELINE_REGISTRY.get(model_name) is not None:
             logger.debug("Model already loaded.", extra={"model_name": model_name})
             return True
 
+        with self._get_lock(model_name):
+            # Another thread may have finished loading while we waited.
+            if self.PIPELINE_REGISTRY.get(model_name) is not None:
+                logger.debug(
+                    "Model loaded by another thread.",
+                    extra={"model_name": model_name},
+                )
+                return True
+            return self._load_model_locked(model_name)
+
+    def _get_lock(self, model_name: str) -> threading.Lock:
+        """
+        Return the load lock for *model_name*, creating it on first use.
+
+        Args:
+            model_name: Registry key of the model.
+
+        Returns:
+            The ``threading.Lock`` serialising loads of that model.
+        """
+        lock = self._LOCKS.get(model_name)
+        if lock is None:
+            with self._LOCKS_LOCK:
+                lock = self._LOCKS.setdefault(model_name, threading.Lock())
+        return lock
+
+    def _load_model_locked(self, model_name: str) -> bool:
+        """
+        Load *model_name* into the registries.  Caller must hold its lock.
+
+        Args:
+            model_name: Registry key of the model to load.
+
+        Returns:
+            ``True`` on success, ``False`` if loading failed (logged).
+        """
         logger.info("Loading LLM model.", extra={"model_name": model_name})
         start_time = time.time()
 
@@ -105,37 +221,71 @@ class LLMService:
 
             use_gpu = torch.cuda.is_available()
             device_label = "GPU" if use_gpu else "CPU"
+            # bf16 keeps the fp32 exponent range (less overflow than fp16 on
+            # Qwen) at the same weight size; only Ampere+ GPUs support it.
+            if use_gpu and torch.cuda.is_bf16_supported():
+                dtype = torch.bfloat16
+            elif use_gpu:
+                dtype = torch.float16
+            else:
+                dtype = torch.float32
             logger.debug(
                 "Loading model weights.",
-                extra={"model_name": model_name, "device": device_label},
+                extra={
+                    "model_name": model_name,
+                    "device": device_label,
+                    "dtype": str(dtype),
+                },
             )
 
+            # safetensors are mmapped and copied tensor-by-tensor straight to
+            # the target device, avoiding the full host-RAM copy that pickle
+            # ``.bin`` checkpoints require.
             model = AutoModelForCausalLM.from_pretrained(
                 model_name,
-                torch_dtype=torch.float16 if use_gpu else torch.float32,
+                torch_dtype=dtype,
                 device_map="auto" if use_gpu else None,
                 trust_remote_code=True,
                 low_cpu_mem_usage=True,
+                use_safetensors=True,
             )
 
             if not use_gpu:
                 model = model.to("cpu")
 
+            # Inference only: freeze parameters so no forward pass ever does
+            # autograd bookkeeping, even on code paths that forget no_grad.
+            model.eval()
+            model.requires_grad_(False)
+
+            # On GPU, let generate() allocate one StaticCache per model and
+            # reset it between calls instead of growing a fresh KV cache per
+            # request, which fragments the CUDA caching allocator.
+            if use_gpu:
+                model.generation_config.cache_implementation = "static"
+
+            gen_cfg = _GenCfg(
+                eos_id=tokenizer.eos_token_id,
+                pad_id=tokenizer.eos_token_id,
+                temperature=self.INFERENCE_PARAMS["temperature"],
+                top_p=self.INFERENCE_PARAMS["top_p"],
+                do_sample=self.INFERENCE_PARAMS["do_sample"],
+                repetition_penalty=self.INFERENCE_PARAMS["repetition_penalty"],
+                static_cache=use_gpu,
+            )
+
             pipe = pipeline(
                 "text-generation",
                 model=model,
                 tokenizer=tokenizer,
                 device=0 if use_gpu else -1,
                 max_new_tokens=self.INFERENCE_PARAMS["max_new_tokens"],
-                temperature=self.INFERENCE_PARAMS["temperature"],
-                top_p=self.INFERENCE_PARAMS["top_p"],
-                do_sample=self.INFERENCE_PARAMS["do_sample"],
-                repetition_penalty=self.INFERENCE_PARAMS["repetition_penalty"],
-                pad_token_id=tokenizer.eos_token_id,
+                **gen_cfg.as_kwargs(),
             )
 
             self.TOKENIZER_REGISTRY[model_name] = tokenizer
             self.MODEL_REGISTRY[model_name] = model
+            self.GEN_CFG_REGISTRY[model_name] = gen_cfg
             self.PIPELINE_REGISTRY[model_name] = pipe
 
             elapsed = time.time() - start_time
@@ -188,6 +338,7 @@ class LLMService:
             loaded and the load attempt failed.
         """
         model_name = model_name or self.DEFAULT_MODEL
+        # Lock-free fast path; ``load_model`` handles the locked slow path.
         if self.PIPELINE_REGISTRY.get(model_name) is not None:
             return True
         logger.debug(
@@ -224,11 +375,13 @@ class LLMService:
             del self.PIPELINE_REGISTRY[model_name]
             del self.MODEL_REGISTRY[model_name]
             del self.TOKENIZER_REGISTRY[model_name]
+            del self.GEN_CFG_REGISTRY[model_name]
 
             # Re-insert None so the registry keys remain consistent.
             self.PIPELINE_REGISTRY[model_name] = None
             self.MODEL_REGISTRY[model_name] = None
             self.TOKENIZER_REGISTRY[model_name] = None
+            self.GEN_CFG_REGISTRY[model_name] = None
 
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
@@ -275,13 +428,26 @@ class LLMService:
         model_name = model_name or self.DEFAULT_MODEL
         max_tokens = max_tokens or self.INFERENCE_PARAMS["max_new_tokens"]
 
+        cache_key = self._answer_cache_key(query, context, model_name, max_tokens)
+        with self._ANSWER_CACHE_LOCK:
+            cached = self._ANSWER_CACHE.get(cache_key)
+            if cached is not None:
+                self._ANSWER_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug("LLM answer cache hit.", extra={"model_name": model_name})
+            return cached, True
+
         if self.is_available(model_name):
             logger.debug(
                 "Attempting LLM generation.",
                 extra={"model_name": model_name, "max_tokens": max_tokens},
             )
             try:
-                return self._generate_with_llm(query, context, model_name, max_tokens)
+                answer, used_llm = self._generate_with_llm(
+                    query, context, model_name, max_tokens
+                )
+                self._store_answer(cache_key, answer)
+                return answer, used_llm
             except Exception as exc:
                 logger.warning(
                     "LLM generation failed — falling back to extractive.",
@@ -296,6 +462,205 @@ class LLMService:
 
         return self._generate_extractive(query, context), False
 
+    def count_tokens(self, text: str, model_name: Optional[str] = None) -> int:
+        """
+        Count *text* in the target model's own tokens.
+
+        Uses the loaded (Rust-backed) HuggingFace tokenizer so counts match
+        what the model actually consumes.  Falls back to a whitespace word
+        count when the tokenizer is not loaded.
+
+        Args:
+            text:       Text to measure.
+            model_name: Model whose tokenizer to use. ``None`` uses
+                        ``DEFAULT_MODEL``.
+
+        Returns:
+            Number of tokens (or words, on fallback) in *text*.
+        """
+        tokenizer = self.TOKENIZER_REGISTRY.get(model_name or self.DEFAULT_MODEL)
+        if tokenizer is None:
+            return len(text.split())
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    def cache_clear(self) -> None:
+        """Drop every memoised LLM answer."""
+        with self._ANSWER_CACHE_LOCK:
+            self._ANSWER_CACHE.clear()
+
+    @staticmethod
+    def _answer_cache_key(
+        query: str, context: str, model_name: str, max_tokens: int
+    ) -> Tuple[str, int, bytes, bytes]:
+        """
+        Build the answer-cache key.
+
+        Query and context are reduced to fixed-size BLAKE2b digests so large
+        contexts are not retained as dict keys.
+        """
+        return (
+            model_name,
+            max_tokens,
+            hashlib.blake2b(query.encode(), digest_size=16).digest(),
+            hashlib.blake2b(context.encode(), digest_size=16).digest(),
+        )
+
+    def _store_answer(self, cache_key: Tuple, answer: str) -> None:
+        """Insert *answer* into the LRU, evicting the oldest entry if full."""
+        if self.ANSWER_CACHE_SIZE <= 0:
+            return
+        with self._ANSWER_CACHE_LOCK:
+            self._ANSWER_CACHE[cache_key] = answer
+            self._ANSWER_CACHE.move_to_end(cache_key)
+            while len(self._ANSWER_CACHE) > self.ANSWER_CACHE_SIZE:
+                self._ANSWER_CACHE.popitem(last=False)
+
+    def iter_answer(
+        self,
+        query: str,
+        context: str,
+        model_name: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Yield an answer grounded in *context*, one decoded fragment at a time.
+
+        ``model.generate`` runs in a daemon thread and pushes text into a
+        ``TextIteratorStreamer`` that this generator drains.  If the model is
+        unavailable, the extractive fallback is yielded as a single fragment.
+        Suitable for ``StreamingHttpResponse`` under WSGI.
+
+        Args:
+            query:      The user's natural-language question.
+            context:    Retrieved document text to ground the answer.
+            model_name: Model to use. ``None`` uses ``DEFAULT_MODEL``.
+            max_tokens: Maximum new tokens to generate.
+                        Falls back to settings value if not provided.
+
+        Yields:
+            Decoded text fragments in generation order.
+
+        Raises:
+            Exception: Re-raised from ``model.generate`` if generation fails
+                       in the worker thread.
+        """
+        model_name = model_name or self.DEFAULT_MODEL
+        max_tokens = max_tokens or self.INFERENCE_PARAMS["max_new_tokens"]
+
+        if not self.is_available(model_name):
+            logger.warning(
+                "LLM unavailable — streaming extractive fallback.",
+                extra={"model_name": model_name},
+            )
+            yield self._generate_extractive(query, context)
+            return
+
+        tokenizer = self.TOKENIZER_REGISTRY[model_name]
+        model = self.MODEL_REGISTRY[model_name]
+
+        prompt = self._build_prompt(query, context, tokenizer)
+        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+        streamer = TextIteratorStreamer(
+            tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+
+        generation_kwargs = dict(
+            **inputs,
+            max_new_tokens=max_tokens,
+            **self.GEN_CFG_REGISTRY[model_name].as_kwargs(),
+        )
+        errors = []
+        thread = threading.Thread(
+            target=self._generate_no_grad,
+            args=(model, self._generation_guard(model_name), streamer, errors),
+            kwargs=generation_kwargs,
+            daemon=True,
+        )
+        start_time = time.time()
+        thread.start()
+
+        logger.debug(
+            "LLM streaming started.",
+            extra={"model_name": model_name, "max_tokens": max_tokens},
+        )
+
+        for fragment in streamer:
+            if fragment:
+                yield fragment
+
+        thread.join()
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            "LLM answer streamed.",
+            extra={
+                "model_name": model_name,
+                "generation_time_seconds": round(time.time() - start_time, 2),
+            },
+        )
+
+    async def stream_answer(
+        self,
+        query: str,
+        context: str,
+        model_name: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of ``iter_answer`` for ASGI callers.
+
+        Not wired up: the views run under gunicorn WSGI and stream through
+        ``iter_answer``; this is kept for an async (ASGI) deployment.  Each
+        blocking step of the underlying generator (model load check,
+        waiting on the streamer) is offloaded with ``asyncio.to_thread`` so
+        the event loop is never blocked.
+
+        Yields:
+            Decoded text fragments in generation order.
+        """
+        stream = self.iter_answer(query, context, model_name, max_tokens)
+        # ``None`` marks the end of the stream.
+        while True:
+            fragment = await asyncio.to_thread(next, stream, None)
+            if fragment is None:
+                break
+            yield fragment
+
+    def _generation_guard(self, model_name: str):
+        """
+        Return the context manager that must wrap a generation on *model_name*.
+
+        Models using a shared static KV cache get their per-model lock; all
+        others get a no-op context so concurrent generations stay parallel.
+        """
+        cfg = self.GEN_CFG_REGISTRY.get(model_name)
+        if cfg is not None and cfg.static_cache:
+            return self._GENERATE_LOCKS[model_name]
+        return contextlib.nullcontext()
+
+    @staticmethod
+    def _generate_no_grad(model, guard, streamer, errors, **generation_kwargs) -> None:
+        """
+        Run ``model.generate`` with autograd disabled while holding *guard*.
+
+        Grad mode is thread-local in PyTorch, so it has to be set inside the
+        worker thread rather than once at import time.  A failure is stored
+        in *errors* and the streamer is closed so the consumer never blocks
+        waiting for tokens that will not come.
+        """
+        try:
+            with guard, torch.inference_mode():
+                model.generate(streamer=streamer, **generation_kwargs)
+        except Exception as exc:
+            logger.error(
+                "LLM streaming generation failed.",
+                extra={"error": str(exc)},
+                exc_info=True,
+            )
+            errors.append(exc)
+            streamer.end()
+
     def _generate_with_llm(
         self,
         query: str,
@@ -321,19 +686,17 @@ class LLMService:
         """
         tokenizer = self.TOKENIZER_REGISTRY[model_name]
         pipe = self.PIPELINE_REGISTRY[model_name]
+        cfg = self.GEN_CFG_REGISTRY[model_name]
 
         prompt = self._build_prompt(query, context, tokenizer)
         start_time = time.time()
 
-        result = pipe(
-            prompt,
-            max_new_tokens=max_tokens,
-            temperature=self.INFERENCE_PARAMS["temperature"],
-            top_p=self.INFERENCE_PARAMS["top_p"],
-            do_sample=self.INFERENCE_PARAMS["do_sample"],
-            repetition_penalty=self.INFERENCE_PARAMS["repetition_penalty"],
-            pad_token_id=tokenizer.eos_token_id,
-        )
+        with self._generation_guard(model_name), torch.inference_mode():
+            result = pipe(
+                prompt,
+                max_new_tokens=max_tokens,
+                **cfg.as_kwargs(),
+            )
 
         if not result or "generated_text" not in result[0]:
             raise ValueError(
@@ -355,7 +718,7 @@ class LLMService:
             extra={
                 "model_name": model_name,
                 "generation_time_seconds": round(elapsed, 2),
-                "answer_tokens": len(answer.split()),
+                "answer_tokens": self.count_tokens(answer, model_name),
             },
         )
         return answer, True
@@ -376,18 +739,40 @@ class LLMService:
             A string containing up to three sentences from *context*, or a
             "no information found" message when *context* is empty.
         """
-        if not context.strip():
+        if not context or context.isspace():
             logger.debug("Extractive fallback: context is empty.")
             return "No relevant information found in the document database."
 
-        sentences = [s.strip() for s in context.replace("\n", " ").split(".") if s.strip()]
+        # Only the first few sentences are needed, so scan a growing prefix
+        # instead of copying the whole (possibly tens-of-KB) context.
+        limit = EXTRACTIVE_PREFIX_LIMIT
+        while True:
+            pieces = context[:limit].split(".")
+            exhausted = limit >= len(context)
+            if not exhausted:
+                # The last piece may be cut mid-sentence.
+                pieces.pop()
+            sentences = []
+            for piece in pieces:
+                piece = piece.translate(_NEWLINE_TO_SPACE).strip()
+                if piece:
+                    sentences.append(piece)
+                    if len(sentences) == 3:
+                        break
+            if len(sentences) == 3 or exhausted:
+                break
+            limit *= 2
+
         if not sentences:
             return "No relevant information found in the document database."
 
-        answer = ". ".join(sentences[:3]) + "."
+        answer = ". ".join(sentences) + "."
         logger.debug(
             "Extractive fallback answer produced.",
-            extra={"sentences_used": min(3, len(sentences)), "total_sentences": len(sentences)},
+            extra={
+                "sentences_used": len(sentences),
+                "chars_scanned": min(limit, len(context)),
+            },
         )
         return answer
 
@@ -0,0 +1,155 @@
+"""
+Dynamic micro-batching of work submitted by concurrent request threads.
+
+``MicroBatcher`` queues items submitted by request threads and hands them to
+``_process`` in batches, so per-call overhead (a model forward pass, a
+database round trip) is paid once per batch rather than once per request.
+
+Batching window
+---------------
+A drainer thread takes the first queued item, then keeps collecting until
+``max_batch`` items are gathered or ``max_wait_ms`` has passed.  It
+dispatches early as soon as every caller currently waiting is already in the
+batch, so a lone request is never delayed by the window.  ``concurrency``
+drainer threads bound the number of batches in flight at once.
+
+Subclasses implement ``_process``; see ``EmbeddingBatcher`` and
+``RetrievalBatcher``.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent ``submit`` calls into shared ``_process`` calls.
+
+    Args:
+        max_batch:   Maximum items per batch.
+        max_wait_ms: Longest a batch waits for more items once it has one.
+        concurrency: Number of batches that may be processed at once.
+    """
+
+    # Prefix of the drainer thread names.
+    name = "micro-batcher"
+
+    def __init__(self, max_batch: int, max_wait_ms: float, concurrency: int) -> None:
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.concurrency = concurrency
+
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        # Callers that have submitted an item not yet taken into a batch.
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def submit(self, item: Any) -> Any:
+        """
+        Process *item* as part of the next batch and wait for its result.
+
+        Raises:
+            Exception: Whatever ``_process`` raised for the batch.
+        """
+        self._ensure_started()
+        future: Future = Future()
+        with self._waiting_lock:
+            self._waiting += 1
+        self._queue.put((item, future))
+        return future.result()
+
+    def _process(self, items: List[Any]) -> List[Any]:
+        """
+        Return one result per item, in order.  Implemented by subclasses.
+
+        An ``Exception`` instance in the returned list is raised in that
+        item's caller only; raising fails the whole batch.
+        """
+        raise NotImplementedError
+
+    # ── Drainer threads ───────────────────────────────────────────────────────
+
+    def _ensure_started(self) -> None:
+        """Start the drainer threads on first use (not at import time)."""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            for i in range(self.concurrency):
+                threading.Thread(
+                    target=self._drain_forever,
+                    name=f"{self.name}-{i}",
+                    daemon=True,
+                ).start()
+            self._started = True
+
+    def _drain_forever(self) -> None:
+        while True:
+            batch = self._collect()
+            self._dispatch(batch)
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        """Block for one item, then gather more within the batching window."""
+        batch = [self._take(block=True)]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._take(block=False))
+                continue
+            except queue.Empty:
+                pass
+            with self._waiting_lock:
+                nobody_waiting = self._waiting == 0
+            remaining = deadline - time.monotonic()
+            if nobody_waiting or remaining <= 0:
+                break
+            try:
+                batch.append(self._take(block=True, timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _take(
+        self, block: bool, timeout: Optional[float] = None
+    ) -> Tuple[Any, Future]:
+        item = self._queue.get(block=block, timeout=timeout)
+        with self._waiting_lock:
+            self._waiting -= 1
+        return item
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Process *batch* and resolve each caller's future."""
+        try:
+            results = self._process([item for item, _ in batch])
+        except Exception as exc:
+            logger.error(
+                "Micro-batch failed.",
+                extra={
+                    "batcher": self.name,
+                    "batch_size": len(batch),
+                    "error": str(exc),
+                },
+            )
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        logger.debug(
+            "Processed micro-batch.",
+            extra={"batcher": self.name, "batch_size": len(batch)},
+        )
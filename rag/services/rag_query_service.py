@@ -1,19 +1,44 @@
 """
 Orchestrates the end-to-end RAG query pipeline:
 
-    embed query → retrieve chunks → build context → generate answer → persist history
+    embed query → retrieve chunks + context → generate answer → persist history
 
 Pipeline stages
 ---------------
 1. **Resolve access** — determine which security levels the user may see.
 2. **Embed**          — convert the query string into a dense vector.
 3. **Retrieve**       — fetch the top-K most similar authorised chunks via
-                        pgvector cosine distance.
+                        a prepared pgvector cosine-distance statement.
 4. **Build context**  — concatenate chunk texts up to ``max_context_length``
-                        characters.
+                        characters.  Done by the same SQL statement as
+                        retrieval, so the context arrives in one round trip.
 5. **Generate**       — call the LLM (or extractive fallback).
 6. **Persist**        — write a ``QueryHistory`` record for analytics and
-                        audit, even on failure.
+                        audit, even on failure.  Successful answers are
+                        written behind the response: the primary key is
+                        drawn from the sequence up front and the INSERT runs
+                        in a Celery task after commit.  Other rows are
+                        inserted inline without their (large) query
+                        embedding, which a Celery task attaches later.
+
+Embedding cache
+---------------
+Query embeddings are cached in two tiers keyed by the normalised query
+(``strip().lower()`` — the MiniLM tokenizer is uncased, so this does not
+change the vector):
+
+* a process-local ``functools.lru_cache`` (``RAG_EMBED_CACHE_SIZE`` entries);
+* the shared Django cache (Redis) under ``emb:i8:<sha256>:<model>`` with a
+  ``RAG_EMBED_CACHE_TTL`` expiry, so warm entries survive restarts.
+
+Redis errors are logged and treated as misses.  Hit/miss counters are
+attached to the "RAG pipeline completed." log record.
+
+Concurrent misses for the same normalised query are coalesced
+("single-flight"): the first thread computes the embedding and the others
+wait on its ``Future`` instead of running the model again.
+Misses for different queries are embedded together: ``embedding_batcher``
+gathers texts from concurrent requests into one ``embed_batch`` call.
 
 Error handling
 --------------
@@ -24,17 +49,27 @@ even for failed queries (``response_source="ERROR"``) so failures are visible
 in the admin and analytics dashboards.
 """
 
+import hashlib
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
+import numpy as np
 from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
 
-from documents.models import DocumentChunk
+from documents.models import Document, DocumentChunk
 from documents.services.embedding import embedding_service
 from rag.models import Chat, QueryHistory
 from rag.services.access_control import get_user_allowed_security_levels
+from rag.services.embedding_batcher import embedding_batcher
+from rag.services.retrieval_batcher import RetrievalBatcher
 from rag.services.llm_service import llm_service
+from rag.tasks import attach_query_embedding_task, persist_query_history_task
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +80,244 @@ logger = logging.getLogger(__name__)
 TOP_K = settings.TOP_K
 SIMILARITY_THRESHOLD = settings.SIMILARITY_THRESHOLD
 MAX_CONTEXT_LENGTH = settings.RAG_MAX_CONTEXT_LENGTH
+HNSW_EF_SEARCH = settings.RAG_HNSW_EF_SEARCH
+RETRIEVAL_WORK_MEM = settings.RAG_RETRIEVAL_WORK_MEM
+RETRIEVAL_STATEMENT_TIMEOUT_MS = settings.RAG_RETRIEVAL_STATEMENT_TIMEOUT_MS
+EMBED_CACHE_SIZE = settings.RAG_EMBED_CACHE_SIZE
+EMBED_CACHE_TTL = settings.RAG_EMBED_CACHE_TTL
+EMBEDDING_DIM = settings.EMBEDDING_DIM
+CHAT_WARM_TTL = settings.RAG_CHAT_WARM_TTL
+CHAT_WARM_THRESHOLD = settings.RAG_CHAT_WARM_THRESHOLD
+
+NO_RESULTS_MESSAGE = (
+    "I could not find any relevant information to answer your question."
+)
+# No model is involved on the NO_RESULTS path, so a word count is used.
+NO_RESULTS_TOKEN_COUNT = len(NO_RESULTS_MESSAGE.split())
+
+# Likely follow-ups to a chat's first question, retrieved ahead of time by
+# ``prewarm_chat``.  ``{topic}`` is the first question without end punctuation.
+PREWARM_TEMPLATES = (
+    "Tell me more about {topic}.",
+    "Give me an example of {topic}.",
+    "What about {topic}?",
+)
+
+# Name of the per-connection prepared statement used by ``_retrieve_chunks``.
+_RETRIEVE_STMT = "rag_retrieve"
+
+# $1 query vectors, $2 allowed security levels, $3 similarity threshold,
+# $4 per-query limit, $5 context character budget.
+#
+# Takes an array of query vectors so single queries and ``query_many``
+# batches share one prepared plan; each vector gets its own top-K via a
+# LATERAL subquery and the result is one row per query (``q_idx`` is the
+# 1-based position in $1; queries without hits produce no row).
+#
+# ``top``: both the threshold and the ORDER BY use the raw ``<=>`` distance
+# (ascending) so the HNSW index can serve the ordering and early-terminate,
+# instead of computing a similarity for every candidate row and sorting.
+# The embedding column itself never leaves Postgres, and the join to the
+# document table projects only ``title`` (not whole document rows).
+#
+# Remaining CTEs: the LLM context is assembled in the database.  Each chunk
+# becomes "[Source N: title]\n<content>" and parts are kept while their
+# running length fits the budget — the same rule as adding chunks in
+# similarity order until the next one would overflow — then joined with
+# blank lines.  Each row carries per-chunk metadata arrays (for the
+# ``sources`` list) plus the finished context, so chunk text is shipped at
+# most once and no per-row objects are built in Python.
+_RETRIEVE_SQL = f"""
+    PREPARE {_RETRIEVE_STMT} (vector[], text[], float8, int, int) AS
+    WITH top AS (
+        SELECT q.q_idx, hit.*
+        FROM unnest($1) WITH ORDINALITY AS q(qvec, q_idx)
+        CROSS JOIN LATERAL (
+            SELECT dc.id, dc.document_id, d.title, dc.chunk_index, dc.content,
+                   dc.embedding <=> q.qvec AS distance
+            FROM {DocumentChunk._meta.db_table} dc
+            JOIN {Document._meta.db_table} d ON d.id = dc.document_id
+            WHERE dc.is_active
+              AND dc.security_level = ANY($2)
+              AND dc.embedding <=> q.qvec <= 1 - $3
+            ORDER BY dc.embedding <=> q.qvec
+            LIMIT $4
+        ) hit
+    ),
+    numbered AS (
+        SELECT top.*,
+               row_number() OVER (PARTITION BY q_idx ORDER BY distance, id) AS n
+        FROM top
+    ),
+    parts AS (
+        SELECT numbered.*,
+               format(E'[Source %s: %s]\\n%s', n, title, content) AS part
+        FROM numbered
+    ),
+    budgeted AS (
+        SELECT parts.*,
+               sum(length(part)) OVER (PARTITION BY q_idx ORDER BY n) AS running_chars
+        FROM parts
+    )
+    SELECT q_idx,
+           array_agg(id ORDER BY n),
+           array_agg(document_id ORDER BY n),
+           array_agg(title ORDER BY n),
+           array_agg(chunk_index ORDER BY n),
+           array_agg(1 - distance ORDER BY n),
+           string_agg(part, E'\\n\\n' ORDER BY n)
+               FILTER (WHERE running_chars <= $5),
+           count(*) FILTER (WHERE running_chars <= $5)
+    FROM budgeted
+    GROUP BY q_idx
+"""
+
+
+class RetrievedChunk(NamedTuple):
+    """Metadata of one chunk returned by the retrieval query."""
+
+    id: int
+    document_id: int
+    document_title: str
+    chunk_index: int
+    similarity: float
+
+
+# Redis-tier counters; the in-process tier reports via ``cache_info()``.
+_embed_cache_stats = {"redis_hits": 0, "redis_misses": 0, "coalesced": 0}
+
+# In-flight embedding computations keyed by normalised query (single-flight).
+_embed_inflight: Dict[str, Future] = {}
+_embed_inflight_lock = threading.Lock()
+
+
+def _check_embedding_dim(vector: Sequence[float]) -> None:
+    """
+    Reject a vector whose length does not match ``settings.EMBEDDING_DIM``.
+
+    A wrong-sized vector (model swap, partial download) would otherwise only
+    fail inside Postgres, after a full retrieval roundtrip.
+
+    Raises:
+        ValueError: If the vector has the wrong number of dimensions.
+    """
+    if len(vector) != EMBEDDING_DIM:
+        raise ValueError(
+            f"Embedding has {len(vector)} dimensions, expected {EMBEDDING_DIM}."
+        )
+
+
+def _quantize_int8(vector: np.ndarray) -> bytes:
+    """
+    Symmetric per-vector int8 quantisation: float32 scale + int8 codes.
+
+    388 bytes for 384 dims instead of 1,536; the cosine error on a
+    unit-norm MiniLM vector is ~1e-4, far below retrieval score gaps.
+    """
+    scale = float(np.abs(vector).max()) / 127 or 1.0
+    codes = np.round(vector / scale).astype(np.int8)
+    return np.float32(scale).tobytes() + codes.tobytes()
+
+
+def _dequantize_int8(packed: bytes) -> np.ndarray:
+    """Inverse of ``_quantize_int8``; returns a read-only ``float32`` array."""
+    scale = np.frombuffer(packed, dtype=np.float32, count=1)[0]
+    vector = np.frombuffer(packed, dtype=np.int8, offset=4).astype(np.float32)
+    vector *= scale
+    vector.flags.writeable = False
+    return vector
+
+
+@lru_cache(maxsize=EMBED_CACHE_SIZE)
+def _embed_normalized_query(normalized: str) -> np.ndarray:
+    """
+    Embed an already-normalised query, consulting Redis before the model.
+
+    Returns a read-only ``float32`` array: it is shared between all
+    ``lru_cache`` callers, so it must never be mutated in place.  Redis
+    stores the int8-quantised vector (see ``_quantize_int8``), and a fresh
+    embedding goes through the same round trip, so every worker searches
+    with the identical vector whether it hit Redis or not.
+    """
+    digest = hashlib.sha256(normalized.encode()).hexdigest()
+    key = f"emb:i8:{digest}:{embedding_service.MODEL_NAME}"
+
+    try:
+        cached = cache.get(key)
+    except Exception as exc:
+        logger.warning(
+            "Embedding cache read failed — embedding directly.",
+            extra={"error": str(exc)},
+        )
+        cached = None
+
+    if cached is not None:
+        _embed_cache_stats["redis_hits"] += 1
+        return _dequantize_int8(cached)
+
+    _embed_cache_stats["redis_misses"] += 1
+    vector = np.asarray(embedding_batcher.embed(normalized), dtype=np.float32)
+    _check_embedding_dim(vector)
+    packed = _quantize_int8(vector)
+    vector = _dequantize_int8(packed)
+
+    try:
+        cache.set(key, packed, EMBED_CACHE_TTL)
+    except Exception as exc:
+        logger.warning(
+            "Embedding cache write failed.",
+            extra={"error": str(exc)},
+        )
+    return vector
+
+
+def embed_query(query_text: str) -> np.ndarray:
+    """
+    Return the embedding for *query_text*, served from cache when possible.
+
+    The result is a shared, read-only ``float32`` array; copy it before
+    modifying.
+
+    Raises:
+        ValueError: If ``query_text`` is empty or whitespace, or the model
+            returns a vector of the wrong dimension.
+    """
+    normalized = query_text.strip().lower()
+    if not normalized:
+        raise ValueError("embed_query received an empty string.")
+
+    with _embed_inflight_lock:
+        future = _embed_inflight.get(normalized)
+        leader = future is None
+        if leader:
+            future = Future()
+            _embed_inflight[normalized] = future
+        else:
+            _embed_cache_stats["coalesced"] += 1
+
+    if not leader:
+        return future.result()
+
+    try:
+        vector = _embed_normalized_query(normalized)
+        future.set_result(vector)
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _embed_inflight_lock:
+            _embed_inflight.pop(normalized, None)
+    return vector
+
+
+def embed_cache_stats() -> Dict[str, int]:
+    """Snapshot of embedding-cache hit/miss counters for logging."""
+    info = _embed_normalized_query.cache_info()
+    return {
+        "memory_hits": info.hits,
+        "memory_misses": info.misses,
+        **_embed_cache_stats,
+    }
 
 
 class RAGQueryService:
@@ -59,6 +332,7 @@ class RAGQueryService:
 
     def __init__(self, max_context_length: Optional[int] = None) -> None:
         self.max_context_length = max_context_length or MAX_CONTEXT_LENGTH
+        self._retrieval_batcher = RetrievalBatcher(self._retrieve_many)
 
     # ──────────────────────────────────────────────────────────────────────────
     # Public API
@@ -113,7 +387,7 @@ class RAGQueryService:
                     "latency_ms": <int>,
                 }
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         user_id = user.id if user else None
 
         logger.info(
@@ -140,7 +414,7 @@ class RAGQueryService:
         try:
             # ── Stage 1: Embed query ──────────────────────────────────────────
             logger.debug("Embedding query.", extra={"user_id": user_id})
-            query_embedding = embedding_service.embed_text(query_text)
+            query_embedding = embed_query(query_text)
 
             # ── Stage 2: Retrieve chunks ──────────────────────────────────────
             logger.debug(
@@ -151,9 +425,11 @@ class RAGQueryService:
                     "allowed_levels": allowed_levels,
                 },
             )
-            chunks, chunk_ids = self._retrieve_chunks(
-                query_embedding=query_embedding,
-                allowed_levels=allowed_levels,
+            chunks, chunk_ids, context = self._retrieve_or_empty(
+                query_embedding,
+                allowed_levels,
+                user_id,
+                chat_id=chat_session.id if chat_session else None,
             )
             logger.debug(
                 "Chunks retrieved.",
@@ -170,12 +446,11 @@ class RAGQueryService:
                     query_text=query_text,
                     query_embedding=query_embedding,
                     effective_max_level=effective_max_level,
-                    start_time=start_time,
+                    start_ns=start_ns,
                     chat_session=chat_session,
                 )
 
-            # ── Stage 3: Build context ────────────────────────────────────────
-            context = self._build_context(chunks)
+            # ── Stage 3: Context (assembled by the retrieval query) ───────────
             logger.debug(
                 "Context assembled.",
                 extra={
@@ -197,15 +472,15 @@ class RAGQueryService:
             )
 
             # ── Stage 5: Persist query history ────────────────────────────────
-            latency_ms = int((time.time() - start_time) * 1000)
-            token_count = len(answer.split())
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            token_count = llm_service.count_tokens(answer, model_name)
             response_source = "LLM" if used_llm else "EXTRACTIVE"
 
-            query_history = QueryHistory.objects.create(
-                user=user,
-                chat=chat_session,
+            query_id = self._write_behind_history(
+                query_embedding,
+                user_id=user_id,
+                chat_id=chat_session.id if chat_session else None,
                 query=query_text,
-                query_embedding=query_embedding,
                 retrieved_chunk_count=len(chunks),
                 retrieved_chunk_ids=chunk_ids,
                 response=answer,
@@ -221,7 +496,7 @@ class RAGQueryService:
                 "RAG pipeline completed.",
                 extra={
                     "user_id": user_id,
-                    "query_id": query_history.id,
+                    "query_id": query_id,
                     "chat_session_id": chat_session.id if chat_session else None,
                     "source": response_source,
                     "model_name": model_name,
@@ -229,32 +504,24 @@ class RAGQueryService:
                     "latency_ms": latency_ms,
                     "token_count": token_count,
                     "effective_max_level": effective_max_level,
+                    "embedding_cache": embed_cache_stats(),
                 },
             )
 
             return {
                 "success": True,
-                "query_id": query_history.id,
+                "query_id": query_id,
                 "answer": answer,
                 "source": response_source,
                 "model": model_name,
                 "chunks_used": len(chunks),
                 "latency_ms": latency_ms,
                 "token_count": token_count,
-                "sources": [
-                    {
-                        "chunk_id": chunk.id,
-                        "document_id": chunk.document_id,
-                        "document_title": chunk.document.title,
-                        "chunk_index": chunk.chunk_index,
-                        "similarity_score": round(chunk.similarity, 4),
-                    }
-                    for chunk in chunks
-                ],
+                "sources": self._build_sources(chunks),
             }
 
         except Exception as exc:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             logger.error(
                 "RAG pipeline failed.",
                 extra={
@@ -283,16 +550,542 @@ class RAGQueryService:
                 "latency_ms": latency_ms,
             }
 
+    def query_stream(
+        self,
+        query_text: str,
+        user=None,
+        model_name: Optional[str] = None,
+        chat_session: Optional[Chat] = None,
+    ) -> Iterator[str]:
+        """
+        Run the RAG pipeline and yield the answer text as it is generated.
+
+        Text-only view of ``stream_events``: yields the ``token`` fragments
+        (and the error notice on failure), dropping the final metadata event.
+
+        Yields:
+            Answer text fragments.
+        """
+        for event in self.stream_events(query_text, user, model_name, chat_session):
+            if "token" in event:
+                yield event["token"]
+            elif "error" in event:
+                yield f"\n\n[Error: {event['error']}]"
+
+    def stream_events(
+        self,
+        query_text: str,
+        user=None,
+        model_name: Optional[str] = None,
+        chat_session: Optional[Chat] = None,
+    ) -> Iterator[Dict]:
+        """
+        Run the RAG pipeline and yield generation events as they happen.
+
+        Same stages as ``query``, but the generation stage streams LLM
+        fragments to the caller (e.g. a server-sent events response) as soon
+        as they are decoded.  The ``QueryHistory`` row is written behind the
+        last fragment, so persistence never sits between the client and its
+        first byte.
+
+        Never raises: on failure an ERROR history row is persisted and an
+        ``error`` event ends the stream.
+
+        Args:
+            query_text:   The user's natural-language question.
+            user:         Django ``User`` used to resolve security clearance.
+            model_name:   LLM to use. ``None`` uses the service's default.
+            chat_session: Optional ``Chat`` to link the QueryHistory record to.
+
+        Yields:
+            ``{"token": <str>}`` per answer fragment, then exactly one of::
+
+                {"done": True, "query_id": <int | None>, "source": <str>,
+                 "model": <str | None>, "chunks_used": <int>,
+                 "latency_ms": <int>, "sources": [...]}
+                {"done": False, "error": <str>, "query_id": <int | None>}
+        """
+        start_ns = time.perf_counter_ns()
+        user_id = user.id if user else None
+        allowed_levels, effective_max_level = get_user_allowed_security_levels(user)
+        fragments: List[str] = []
+
+        try:
+            query_embedding = embed_query(query_text)
+            chunks, chunk_ids, context = self._retrieve_or_empty(
+                query_embedding,
+                allowed_levels,
+                user_id,
+                chat_id=chat_session.id if chat_session else None,
+            )
+
+            if not chunks:
+                yield {"token": NO_RESULTS_MESSAGE}
+                response = self._build_no_results_response(
+                    user=user,
+                    query_text=query_text,
+                    query_embedding=query_embedding,
+                    effective_max_level=effective_max_level,
+                    start_ns=start_ns,
+                    chat_session=chat_session,
+                )
+                response.pop("answer")
+                response.pop("success")
+                yield {"done": True, **response}
+                return
+
+            used_llm = llm_service.is_available(model_name)
+            for fragment in llm_service.iter_answer(
+                query=query_text, context=context, model_name=model_name
+            ):
+                fragments.append(fragment)
+                yield {"token": fragment}
+
+            # ── Persist once the client has the whole answer ──────────────────
+            answer = "".join(fragments).strip()
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            response_source = "LLM" if used_llm else "EXTRACTIVE"
+            query_id = self._write_behind_history(
+                query_embedding,
+                user_id=user_id,
+                chat_id=chat_session.id if chat_session else None,
+                query=query_text,
+                retrieved_chunk_count=len(chunks),
+                retrieved_chunk_ids=chunk_ids,
+                response=answer,
+                response_source=response_source,
+                latency_ms=latency_ms,
+                token_count=llm_service.count_tokens(answer, model_name),
+                security_level=effective_max_level,
+                is_flagged=False,
+                flag_reason="",
+            )
+
+            logger.info(
+                "RAG streaming pipeline completed.",
+                extra={
+                    "user_id": user_id,
+                    "query_id": query_id,
+                    "source": response_source,
+                    "model_name": model_name,
+                    "chunks_used": len(chunks),
+                    "latency_ms": latency_ms,
+                },
+            )
+            yield {
+                "done": True,
+                "query_id": query_id,
+                "source": response_source,
+                "model": model_name,
+                "chunks_used": len(chunks),
+                "latency_ms": latency_ms,
+                "sources": self._build_sources(chunks),
+            }
+
+        except Exception as exc:
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            logger.error(
+                "RAG streaming pipeline failed.",
+                extra={
+                    "user_id": user_id,
+                    "error": str(exc),
+                    "error_type": type(exc).__name__,
+                    "latency_ms": latency_ms,
+                },
+                exc_info=True,
+            )
+            q_id = self._persist_error_history(
+                user=user,
+                chat_session=chat_session,
+                query_text=query_text,
+                exc=exc,
+                latency_ms=latency_ms,
+                effective_max_level=effective_max_level,
+            )
+            yield {
+                "done": False,
+                "error": "the answer could not be completed.",
+                "query_id": q_id,
+            }
+
+    def query_many(
+        self,
+        queries: List[str],
+        user=None,
+        model_name: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Run the RAG pipeline for several questions from the same user.
+
+        Embeddings are computed in one ``embed_batch`` forward pass and all
+        retrievals run as a single prepared statement (one LATERAL top-K per
+        query).  Generation then runs per query — the local model is shared,
+        so there is nothing to gain from running it concurrently — and the
+        successful ``QueryHistory`` rows are written with one
+        ``bulk_create``.
+
+        Args:
+            queries:    The user's natural-language questions.
+            user:       Django ``User`` used to resolve security clearance.
+            model_name: LLM to use. ``None`` uses the service's default.
+
+        Returns:
+            One response dict per query, in input order, shaped exactly like
+            the return value of ``query``.  Never raises.
+        """
+        if not queries:
+            return []
+
+        start_ns = time.perf_counter_ns()
+        user_id = user.id if user else None
+        allowed_levels, effective_max_level = get_user_allowed_security_levels(user)
+
+        logger.info(
+            "RAG batch pipeline started.",
+            extra={
+                "user_id": user_id,
+                "model_name": model_name,
+                "batch_size": len(queries),
+            },
+        )
+
+        try:
+            embeddings = embedding_service.embed_batch(queries)
+            for embedding in embeddings:
+                _check_embedding_dim(embedding)
+            retrieved = self._retrieve_many(
+                embeddings, allowed_levels, SIMILARITY_THRESHOLD
+            )
+        except Exception as exc:
+            latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            logger.error(
+                "RAG batch pipeline failed.",
+                extra={"user_id": user_id, "error": str(exc), "latency_ms": latency_ms},
+                exc_info=True,
+            )
+            return self._batch_error_responses(
+                queries, user, exc, latency_ms, effective_max_level
+            )
+
+        responses: List[Optional[Dict]] = [None] * len(queries)
+        pending: List[Tuple[int, QueryHistory, List[float], List[RetrievedChunk]]] = []
+
+        for i, (query_text, embedding, (chunks, chunk_ids, context, _)) in enumerate(
+            zip(queries, embeddings, retrieved)
+        ):
+            if not chunks:
+                responses[i] = self._build_no_results_response(
+                    user=user,
+                    query_text=query_text,
+                    query_embedding=embedding,
+                    effective_max_level=effective_max_level,
+                    start_ns=start_ns,
+                )
+                continue
+
+            answer, used_llm = llm_service.generate_answer(
+                query=query_text, context=context, model_name=model_name
+            )
+            history = QueryHistory(
+                user=user,
+                query=query_text,
+                retrieved_chunk_count=len(chunks),
+                retrieved_chunk_ids=chunk_ids,
+                response=answer,
+                response_source="LLM" if used_llm else "EXTRACTIVE",
+                latency_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                token_count=llm_service.count_tokens(answer, model_name),
+                security_level=effective_max_level,
+            )
+            pending.append((i, history, embedding, chunks))
+
+        self._persist_batch_history(pending, responses, user_id, model_name)
+
+        logger.info(
+            "RAG batch pipeline completed.",
+            extra={
+                "user_id": user_id,
+                "batch_size": len(queries),
+                "answered": len(pending),
+                "latency_ms": (time.perf_counter_ns() - start_ns) // 1_000_000,
+            },
+        )
+        return responses
+
+    def _batch_error_responses(
+        self,
+        queries: List[str],
+        user,
+        exc: Exception,
+        latency_ms: int,
+        effective_max_level: str,
+    ) -> List[Dict]:
+        """Record an error row per query of a failed batch and build responses."""
+        return [
+            {
+                "success": False,
+                "query_id": self._persist_error_history(
+                    user=user,
+                    query_text=query_text,
+                    exc=exc,
+                    latency_ms=latency_ms,
+                    effective_max_level=effective_max_level,
+                ),
+                "error": str(exc),
+                "latency_ms": latency_ms,
+            }
+            for query_text in queries
+        ]
+
+    def _persist_batch_history(
+        self,
+        pending: List[Tuple[int, QueryHistory, List[float], List[RetrievedChunk]]],
+        responses: List[Optional[Dict]],
+        user_id: Optional[int],
+        model_name: Optional[str],
+    ) -> None:
+        """
+        Bulk-insert the answered rows of a batch and fill their responses.
+
+        A failed insert is logged; the answers are still returned, with a
+        ``None`` ``query_id``.
+        """
+        try:
+            QueryHistory.objects.bulk_create([history for _, history, _, _ in pending])
+        except Exception as exc:
+            logger.error(
+                "Failed to persist batch query history.",
+                extra={"user_id": user_id, "error": str(exc)},
+                exc_info=True,
+            )
+
+        for i, history, embedding, chunks in pending:
+            if history.id is not None:
+                self._defer_embedding(history.id, embedding)
+            responses[i] = {
+                "success": True,
+                "query_id": history.id,
+                "answer": history.response,
+                "source": history.response_source,
+                "model": model_name,
+                "chunks_used": len(chunks),
+                "latency_ms": history.latency_ms,
+                "token_count": history.token_count,
+                "sources": self._build_sources(chunks),
+            }
+
+    def record_cached_response(
+        self,
+        user,
+        query_text: str,
+        query_embedding: Optional[Sequence[float]],
+        cached: Dict,
+        effective_max_level: str,
+        start_ns: int,
+        source: str = "SEMANTIC_CACHE",
+    ) -> Dict:
+        """
+        Persist a response reused from another query and build its response.
+
+        Args:
+            user:               Django user (may be ``None``).
+            query_text:         Original query string.
+            query_embedding:    Embedded query vector, if already computed.
+            cached:             Response dict being reused.
+            effective_max_level: The user's highest permitted security level.
+            start_ns:           ``time.perf_counter_ns()`` value at request entry.
+            source:             ``"SEMANTIC_CACHE"`` or ``"COALESCED"``.
+
+        Returns:
+            *cached* re-stamped with the new ``query_id``, the request's
+            latency and *source*.
+        """
+        latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        sources = cached.get("sources", [])
+        q_id = None
+
+        try:
+            q_id = self._write_behind_history(
+                query_embedding,
+                user_id=user.id if user else None,
+                query=query_text,
+                retrieved_chunk_count=len(sources),
+                retrieved_chunk_ids=[source["chunk_id"] for source in sources],
+                response=cached["answer"],
+                response_source=source,
+                latency_ms=latency_ms,
+                token_count=cached.get("token_count", 0),
+                security_level=effective_max_level,
+                is_flagged=False,
+                flag_reason="",
+            )
+        except Exception as db_exc:
+            logger.error(
+                "Failed to persist reused-response query history.",
+                extra={
+                    "user_id": user.id if user else None,
+                    "source": source,
+                    "error": str(db_exc),
+                },
+                exc_info=True,
+            )
+
+        return {
+            **cached,
+            "query_id": q_id,
+            "source": source,
+            "latency_ms": latency_ms,
+        }
+
+    def prewarm_chat(self, chat_id: int, user, seed_query: str) -> int:
+        """
+        Prefetch retrievals for likely follow-ups to a chat's first question.
+
+        Embeds ``PREWARM_TEMPLATES`` filled with *seed_query* in one batch,
+        retrieves them in one statement, and stores the non-empty results
+        under ``chat:<id>:warm`` for ``RAG_CHAT_WARM_TTL`` seconds.  Later
+        queries in the chat whose embedding is within
+        ``RAG_CHAT_WARM_THRESHOLD`` of a prefetched one reuse its chunks and
+        context instead of querying pgvector.  Meant to run in a Celery task.
+
+        Args:
+            chat_id:    Chat whose follow-ups are prefetched.
+            user:       Chat owner; their security levels scope retrieval.
+            seed_query: The chat's first question.
+
+        Returns:
+            Number of prefetched retrievals stored.
+        """
+        topic = seed_query.strip().rstrip("?.! ")
+        if not topic:
+            return 0
+        texts = [template.format(topic=topic) for template in PREWARM_TEMPLATES]
+        allowed_levels, _ = get_user_allowed_security_levels(user)
+
+        embeddings = embedding_service.embed_batch(texts)
+        retrieved = self._retrieve_many(
+            embeddings, allowed_levels, SIMILARITY_THRESHOLD
+        )
+        entries = [
+            (
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                tuple(allowed_levels),
+                [tuple(chunk) for chunk in chunks],
+                chunk_ids,
+                context,
+            )
+            for embedding, (chunks, chunk_ids, context, _) in zip(embeddings, retrieved)
+            if chunks
+        ]
+        if entries:
+            cache.set(self._chat_warm_key(chat_id), entries, CHAT_WARM_TTL)
+        logger.debug(
+            "Chat retrieval cache prewarmed.",
+            extra={"chat_id": chat_id, "entries": len(entries)},
+        )
+        return len(entries)
+
     # ──────────────────────────────────────────────────────────────────────────
     # Private helpers
     # ──────────────────────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _build_sources(chunks: List[RetrievedChunk]) -> List[Dict]:
+        """Build the ``sources`` list of a success response."""
+        # One vectorised rounding pass instead of round() per chunk.
+        similarity_scores = np.round(
+            np.fromiter(
+                (c.similarity for c in chunks), dtype=np.float64, count=len(chunks)
+            ),
+            4,
+        ).tolist()
+        return [
+            {
+                "chunk_id": chunk.id,
+                "document_id": chunk.document_id,
+                "document_title": chunk.document_title,
+                "chunk_index": chunk.chunk_index,
+                "similarity_score": score,
+            }
+            for chunk, score in zip(chunks, similarity_scores)
+        ]
+
+    def _retrieve_or_empty(
+        self,
+        query_embedding: np.ndarray,
+        allowed_levels: List[str],
+        user_id: Optional[int],
+        chat_id: Optional[int] = None,
+    ) -> Tuple[List[RetrievedChunk], List[int], str]:
+        """
+        ``_retrieve_chunks``, degrading to "no chunks" on a DB-level abort.
+
+        An ``OperationalError`` here is most likely the retrieval
+        ``statement_timeout``; callers answer NO_RESULTS rather than a 500.
+        Queries in a chat first probe the chat's prefetched retrievals (see
+        ``prewarm_chat``).
+        """
+        if chat_id is not None:
+            warm = self._warm_retrieval(chat_id, query_embedding, allowed_levels)
+            if warm is not None:
+                return warm
+        try:
+            return self._retrieve_chunks(
+                query_embedding=query_embedding,
+                allowed_levels=allowed_levels,
+            )
+        except OperationalError as exc:
+            logger.warning(
+                "Retrieval aborted — returning NO_RESULTS.",
+                extra={"user_id": user_id, "error": str(exc)},
+            )
+            return [], [], ""
+
+    @staticmethod
+    def _chat_warm_key(chat_id: int) -> str:
+        return f"chat:{chat_id}:warm"
+
+    def _warm_retrieval(
+        self,
+        chat_id: int,
+        query_embedding: Sequence[float],
+        allowed_levels: List[str],
+    ) -> Optional[Tuple[List[RetrievedChunk], List[int], str]]:
+        """
+        Return a prefetched retrieval close enough to *query_embedding*.
+
+        Entries prefetched under other security levels (e.g. the user's role
+        changed since) are ignored.  Cache errors count as a miss.
+        """
+        try:
+            entries = cache.get(self._chat_warm_key(chat_id))
+        except Exception as exc:
+            logger.warning(
+                "Chat warm-cache read failed — retrieving directly.",
+                extra={"chat_id": chat_id, "error": str(exc)},
+            )
+            return None
+        if not entries:
+            return None
+
+        # Embeddings are L2-normalised, so the dot product is cosine similarity.
+        query = np.asarray(query_embedding, dtype=np.float32)
+        levels = tuple(allowed_levels)
+        for vector, entry_levels, chunks, chunk_ids, context in entries:
+            if entry_levels != levels:
+                continue
+            similarity = float(np.frombuffer(vector, dtype=np.float32) @ query)
+            if similarity >= CHAT_WARM_THRESHOLD:
+                logger.debug("Chat warm-cache hit.", extra={"chat_id": chat_id})
+                return [RetrievedChunk(*chunk) for chunk in chunks], chunk_ids, context
+        return None
+
     def _retrieve_chunks(
         self,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         allowed_levels: List[str],
         similarity_threshold: Optional[float] = None,
-    ) -> Tuple[List[DocumentChunk], List[int]]:
+    ) -> Tuple[List[RetrievedChunk], List[int], str]:
         """
         Query pgvector for the top-K most similar active chunks above a
         minimum similarity threshold.
@@ -301,6 +1094,12 @@ class RAGQueryService:
         LLM as if they were relevant — a major cause of hallucination when
         the queried concept does not exist in any document.
 
+        Runs a server-side prepared statement (see ``_RETRIEVE_SQL``) instead
+        of compiling an ORM queryset per request, so Postgres can reuse the
+        plan on a persistent connection.  The same statement assembles the
+        LLM context: chunks are added in similarity order until
+        ``max_context_length`` characters would be exceeded.
+
         Args:
             query_embedding:     Dense query vector.
             allowed_levels:      Security levels the user may access.
@@ -310,23 +1109,18 @@ class RAGQueryService:
                                   Falls back to settings value if not provided.
 
         Returns:
-            ``(chunks, chunk_ids)``
-        """
-        from pgvector.django import CosineDistance
+            ``(chunks, chunk_ids, context)``
 
+        Raises:
+            OperationalError: If the statement exceeds
+                ``RAG_RETRIEVAL_STATEMENT_TIMEOUT_MS`` (or another DB error).
+        """
         threshold = similarity_threshold or SIMILARITY_THRESHOLD
-
-        qs = (
-            DocumentChunk.objects
-            .filter(is_active=True, security_level__in=allowed_levels)
-            .annotate(similarity=1 - CosineDistance("embedding", query_embedding))
-            .filter(similarity__gte=threshold)
-            .select_related("document")
-            .order_by("-similarity")[:TOP_K]
+        # Coalesced with concurrent requests' retrievals into one statement.
+        chunks, chunk_ids, context, included = self._retrieval_batcher.retrieve(
+            query_embedding, allowed_levels, threshold
         )
 
-        chunks = list(qs)
-
         if not chunks:
             logger.info(
                 "No chunks met the similarity threshold.",
@@ -345,50 +1139,101 @@ class RAGQueryService:
                     "similarity_scores": scores,
                 },
             )
+            if included < len(chunks):
+                logger.debug(
+                    "Context budget exhausted — truncating.",
+                    extra={
+                        "chunks_included": included,
+                        "chars_used": len(context),
+                        "max_context_length": self.max_context_length,
+                    },
+                )
 
-        return chunks, [c.id for c in chunks]
+        return chunks, chunk_ids, context
 
-    def _build_context(self, chunks: List[DocumentChunk]) -> str:
+    def _retrieve_many(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        allowed_levels: List[str],
+        threshold: float,
+    ) -> List[Tuple[List[RetrievedChunk], List[int], str, int]]:
         """
-        Concatenate chunk texts into a single context string.
-
-        Chunks are added in the order provided (highest similarity first)
-        until ``max_context_length`` characters would be exceeded.  The
-        truncation point is logged at DEBUG level.
+        Run the retrieval statement for one or more query vectors at once.
 
         Args:
-            chunks: Ordered list of retrieved ``DocumentChunk`` objects.
+            query_embeddings: Dense query vectors.
+            allowed_levels:   Security levels the user may access.
+            threshold:        Minimum cosine similarity.
 
         Returns:
-            A multi-paragraph context string with source attributions.
+            One ``(chunks, chunk_ids, context, chunks_in_context)`` tuple per
+            input vector, in input order.
+
+        Raises:
+            OperationalError: If the statement exceeds
+                ``RAG_RETRIEVAL_STATEMENT_TIMEOUT_MS`` (or another DB error).
         """
-        parts: List[str] = []
-        total_chars = 0
+        # Postgres array literal of pgvector literals: {"[..]","[..]"}
+        vectors_literal = (
+            "{"
+            + ",".join(
+                '"[' + ",".join(map(str, np.asarray(embedding, np.float32))) + ']"'
+                for embedding in query_embeddings
+            )
+            + "}"
+        )
 
-        for i, chunk in enumerate(chunks):
-            text = f"[Source {i + 1}: {chunk.document.title}]\n{chunk.content}"
-            if total_chars + len(text) > self.max_context_length:
-                logger.debug(
-                    "Context budget exhausted — truncating.",
-                    extra={
-                        "chunks_included": i,
-                        "chars_used": total_chars,
-                        "max_context_length": self.max_context_length,
-                    },
-                )
-                break
-            parts.append(text)
-            total_chars += len(text)
+        # SET LOCAL only lasts for the enclosing transaction, so the tuning
+        # never leaks onto other queries sharing the connection.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL hnsw.ef_search = %s", [HNSW_EF_SEARCH])
+            cursor.execute("SET LOCAL work_mem = %s", [RETRIEVAL_WORK_MEM])
+            cursor.execute(
+                "SET LOCAL statement_timeout = %s", [RETRIEVAL_STATEMENT_TIMEOUT_MS]
+            )
+            self._ensure_retrieve_prepared(cursor)
+            cursor.execute(
+                f"EXECUTE {_RETRIEVE_STMT} (%s, %s, %s, %s, %s)",
+                [
+                    vectors_literal,
+                    list(allowed_levels),
+                    threshold,
+                    TOP_K,
+                    self.max_context_length,
+                ],
+            )
+            rows = cursor.fetchall()
 
-        return "\n\n".join(parts)
+        results = [([], [], "", 0) for _ in query_embeddings]
+        for q_idx, ids, doc_ids, titles, indexes, sims, context, included in rows:
+            chunks = [
+                RetrievedChunk(*row) for row in zip(ids, doc_ids, titles, indexes, sims)
+            ]
+            results[q_idx - 1] = (chunks, ids, context or "", included)
+        return results
+
+    @staticmethod
+    def _ensure_retrieve_prepared(cursor) -> None:
+        """
+        ``PREPARE`` the retrieval statement once per physical DB connection.
+
+        Prepared statements live for the lifetime of a Postgres session, so
+        the raw connection they were prepared on is remembered on the Django
+        connection wrapper; a reconnect triggers a fresh ``PREPARE``.
+        """
+        raw_connection = connection.connection
+        if getattr(connection, "_rag_retrieve_prepared_on", None) is raw_connection:
+            return
+        cursor.execute(_RETRIEVE_SQL)
+        connection._rag_retrieve_prepared_on = raw_connection
 
     def _build_no_results_response(
         self,
         user,
         query_text: str,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         effective_max_level: str,
-        start_time: float,
+        start_ns: int,
         chat_session: Optional[Chat] = None,
     ) -> Dict:
         """
@@ -399,14 +1244,14 @@ class RAGQueryService:
             query_text:         Original query string.
             query_embedding:    Embedded query vector.
             effective_max_level: The user's highest permitted security level.
-            start_time:         ``time.time()`` value at pipeline entry.
+            start_ns:           ``time.perf_counter_ns()`` value at pipeline entry.
             chat_session:       Optional chat session to link the record to.
 
         Returns:
             A success-shaped response dict with ``source="NO_RESULTS"``.
         """
-        latency_ms = int((time.time() - start_time) * 1000)
-        message = "I could not find any relevant information to answer your question."
+        latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        message = NO_RESULTS_MESSAGE
         q_id = None
 
         try:
@@ -414,18 +1259,18 @@ class RAGQueryService:
                 user=user,
                 chat=chat_session,
                 query=query_text,
-                query_embedding=query_embedding,
                 retrieved_chunk_count=0,
                 retrieved_chunk_ids=[],
                 response=message,
                 response_source="NO_RESULTS",
                 latency_ms=latency_ms,
-                token_count=len(message.split()),
+                token_count=NO_RESULTS_TOKEN_COUNT,
                 security_level=effective_max_level,
                 is_flagged=False,
                 flag_reason="",
             )
             q_id = qh.id
+            self._defer_embedding(q_id, query_embedding)
         except Exception as db_exc:
             logger.error(
                 "Failed to persist NO_RESULTS query history.",
@@ -441,10 +1286,124 @@ class RAGQueryService:
             "model": None,
             "chunks_used": 0,
             "latency_ms": latency_ms,
-            "token_count": len(message.split()),
+            "token_count": NO_RESULTS_TOKEN_COUNT,
             "sources": [],
         }
 
+    def _write_behind_history(
+        self, query_embedding: Optional[Sequence[float]], **fields
+    ) -> int:
+        """
+        Persist a ``QueryHistory`` row without blocking the response on it.
+
+        The primary key is drawn from the table's sequence here so the
+        response can carry ``query_id`` immediately; the INSERT (embedding
+        included) runs in ``persist_query_history_task`` once the current
+        transaction commits.  If the task cannot be enqueued the row is
+        written inline, so the audit record is not lost with the broker.
+
+        Args:
+            query_embedding: Query vector, or ``None`` if never computed.
+            **fields:        ``QueryHistory`` values by attribute name
+                             (``user_id``/``chat_id`` for foreign keys).
+
+        Returns:
+            The pre-allocated ``QueryHistory`` primary key.
+        """
+        fields["id"] = self._allocate_query_id()
+        embedding = (
+            None
+            if query_embedding is None
+            else np.asarray(query_embedding, dtype=np.float32).tolist()
+        )
+
+        def enqueue() -> None:
+            try:
+                persist_query_history_task.delay(fields, embedding)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to enqueue query history persistence — writing inline.",
+                    extra={"query_id": fields["id"], "error": str(exc)},
+                )
+                persist_query_history_task(fields, embedding)
+
+        transaction.on_commit(enqueue)
+        return fields["id"]
+
+    @staticmethod
+    def _allocate_query_id() -> int:
+        """Draw the next ``QueryHistory`` primary key from its sequence."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id'))",
+                [QueryHistory._meta.db_table],
+            )
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _defer_embedding(
+        query_history_id: int, query_embedding: Sequence[float]
+    ) -> None:
+        """
+        Queue the embedding UPDATE for *query_history_id* after commit.
+
+        Enqueue failures (e.g. broker down) only cost the audit copy of the
+        embedding, so they are logged rather than raised.
+        """
+
+        def enqueue() -> None:
+            try:
+                attach_query_embedding_task.delay(
+                    query_history_id,
+                    np.asarray(query_embedding, dtype=np.float32).tolist(),
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Failed to enqueue query embedding persistence.",
+                    extra={"query_id": query_history_id, "error": str(exc)},
+                )
+
+        transaction.on_commit(enqueue)
+
+    def record_coalesced_failure(
+        self,
+        user,
+        query_text: str,
+        failed: Dict,
+        effective_max_level: str,
+        start_ns: int,
+    ) -> Dict:
+        """
+        Record a follower's own ERROR row for a failed coalesced pipeline run.
+
+        The leader's error response carries the leader's ``query_id``, which
+        must not be handed to another user.
+
+        Args:
+            user:                Django user (may be ``None``).
+            query_text:          Original query string.
+            failed:              The leader's ``success=False`` response.
+            effective_max_level: The user's highest permitted security level.
+            start_ns:            ``time.perf_counter_ns()`` value at request entry.
+
+        Returns:
+            A ``success=False`` response with the follower's own ``query_id``.
+        """
+        latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        error = failed.get("error", "Unknown error")
+        return {
+            "success": False,
+            "query_id": self._persist_error_history(
+                user=user,
+                query_text=query_text,
+                exc=RuntimeError(error),
+                latency_ms=latency_ms,
+                effective_max_level=effective_max_level,
+            ),
+            "error": error,
+            "latency_ms": latency_ms,
+        }
+
     def _persist_error_history(
         self,
         user,
@@ -0,0 +1,110 @@
+"""
+Dynamic micro-batching of pgvector retrievals across concurrent requests.
+
+The retrieval statement already answers any number of query vectors in one
+round trip (one LATERAL top-K per vector, see ``_RETRIEVE_SQL``).
+``RetrievalBatcher`` gathers the vectors submitted by concurrent request
+threads (see ``MicroBatcher`` for the batching window) and runs them as one
+statement per security scope: requests with different allowed levels or
+thresholds form separate sub-batches of the same drain cycle.
+
+If a sub-batch's statement fails (e.g. one plan hits ``statement_timeout``),
+its vectors are retried one by one, so only the failing request sees the
+error.
+
+Each drainer thread holds its own Django database connection.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from rag.services.micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# (query_embedding, allowed_levels, threshold)
+RetrievalRequest = Tuple[Sequence[float], Tuple[str, ...], float]
+
+
+class RetrievalBatcher(MicroBatcher):
+    """
+    Coalesce concurrent single-vector retrievals into multi-vector ones.
+
+    Args:
+        retrieve_many: ``RAGQueryService._retrieve_many`` of the owning
+                       service; called once per scope in a batch.
+        max_batch:     Maximum vectors per drain cycle.
+        max_wait_ms:   Longest a batch waits for more vectors once it has one.
+        concurrency:   Number of batches (and DB connections) in flight.
+    """
+
+    name = "retrieval-batcher"
+
+    def __init__(
+        self,
+        retrieve_many: Callable[..., List],
+        max_batch: int = settings.RAG_RETRIEVE_BATCH_MAX_SIZE,
+        max_wait_ms: float = settings.RAG_RETRIEVE_BATCH_WAIT_MS,
+        concurrency: int = settings.RAG_RETRIEVE_BATCH_CONCURRENCY,
+    ) -> None:
+        super().__init__(max_batch, max_wait_ms, concurrency)
+        self._retrieve_many = retrieve_many
+
+    def retrieve(
+        self,
+        query_embedding: Sequence[float],
+        allowed_levels: Sequence[str],
+        threshold: float,
+    ) -> Tuple:
+        """
+        Retrieve for one vector as part of the next batch.
+
+        Returns:
+            ``(chunks, chunk_ids, context, chunks_in_context)``
+
+        Raises:
+            OperationalError: If the batch's statement fails.
+        """
+        return self.submit((query_embedding, tuple(allowed_levels), threshold))
+
+    def _process(self, requests: List[RetrievalRequest]) -> List[Tuple]:
+        # Drop connections that went stale while the thread sat idle.
+        close_old_connections()
+
+        groups: Dict[Tuple[Tuple[str, ...], float], List[int]] = defaultdict(list)
+        for i, (_, levels, threshold) in enumerate(requests):
+            groups[(levels, threshold)].append(i)
+
+        results: List = [None] * len(requests)
+        for (levels, threshold), indexes in groups.items():
+            vectors = [requests[i][0] for i in indexes]
+            try:
+                retrieved = self._retrieve_many(vectors, list(levels), threshold)
+            except Exception as exc:
+                if len(vectors) > 1:
+                    logger.warning(
+                        "Batched retrieval failed — retrying vectors one by one.",
+                        extra={"batch_size": len(vectors), "error": str(exc)},
+                    )
+                    retrieved = [
+                        self._retrieve_one(vector, levels, threshold)
+                        for vector in vectors
+                    ]
+                else:
+                    retrieved = [exc]
+            for i, result in zip(indexes, retrieved):
+                results[i] = result
+        return results
+
+    def _retrieve_one(
+        self, vector: Sequence[float], levels: Tuple[str, ...], threshold: float
+    ):
+        """Retrieve for one vector; return the exception instead of raising."""
+        try:
+            return self._retrieve_many([vector], list(levels), threshold)[0]
+        except Exception as exc:
+            return exc
@@ -0,0 +1,200 @@
+"""
+In-process semantic cache for RAG responses.
+
+Near-duplicate questions ("What was Q3 revenue?" / "what was the Q3 revenue")
+embed to almost the same vector, so their answers can be reused without
+re-running retrieval and generation.
+
+Lookup
+------
+Entries live in a preallocated ``(max_size, EMBEDDING_DIM)`` ``float32``
+matrix of L2-normalised query embeddings.  A lookup is one matrix-vector
+product (exact inner-product search, equivalent to a flat IP index) masked
+to live entries of the caller's scope; the best score must reach
+``RAG_SEMANTIC_CACHE_THRESHOLD`` to count as a hit.
+
+Scoping
+-------
+Every entry is tagged with a scope string — the caller's effective security
+level plus the model name.  Retrieval only depends on the allowed security
+levels, so a cached answer is only ever served to users who could have
+retrieved the same chunks themselves.
+
+Eviction
+--------
+Entries expire ``RAG_SEMANTIC_CACHE_TTL`` seconds after insertion (so newly
+uploaded documents are picked up) and the least recently used entry is
+evicted once ``RAG_SEMANTIC_CACHE_SIZE`` entries are held.
+
+The cache is per process; each gunicorn worker warms its own copy.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """One cached pipeline response and its bookkeeping."""
+
+    result: Dict
+    scope: str
+    created_at: float
+    hits: int = 0
+
+
+class SemanticCache:
+    """
+    Thread-safe, TTL + LRU bounded nearest-neighbour cache of RAG responses.
+
+    Args:
+        max_size:  Maximum number of entries held.
+        ttl:       Seconds an entry stays valid after insertion.
+        threshold: Minimum cosine similarity for a hit.
+        dim:       Embedding dimension.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.RAG_SEMANTIC_CACHE_SIZE,
+        ttl: float = settings.RAG_SEMANTIC_CACHE_TTL,
+        threshold: float = settings.RAG_SEMANTIC_CACHE_THRESHOLD,
+        dim: int = settings.EMBEDDING_DIM,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+
+        self._vectors = np.zeros((max_size, dim), dtype=np.float32)
+        # Slot metadata, parallel to ``_vectors``; scope id -1 marks a free slot.
+        self._scope_ids = np.full(max_size, -1, dtype=np.int32)
+        self._expires = np.zeros(max_size, dtype=np.float64)
+
+        # slot → entry, least recently used first.
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._free_slots = list(range(max_size - 1, -1, -1))
+        self._scope_index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def get(self, embedding: Sequence[float], scope: str) -> Optional[Dict]:
+        """
+        Return the cached result closest to *embedding* within *scope*.
+
+        Args:
+            embedding: Query embedding (normalised here).
+            scope:     Scope key, see module docstring.
+
+        Returns:
+            A shallow copy of the cached result, or ``None`` on a miss.
+        """
+        if not self.max_size:
+            return None
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            scope_id = self._scope_index.get(scope)
+            if scope_id is None:
+                return None
+
+            live = (self._scope_ids == scope_id) & (self._expires > time.monotonic())
+            if not live.any():
+                return None
+
+            scores = self._vectors @ query
+            scores[~live] = -np.inf
+            slot = int(scores.argmax())
+            if scores[slot] < self.threshold:
+                return None
+
+            entry = self._entries[slot]
+            entry.hits += 1
+            self._entries.move_to_end(slot)
+            similarity = float(scores[slot])
+
+        logger.debug(
+            "Semantic cache hit.",
+            extra={"scope": scope, "similarity": similarity, "hits": entry.hits},
+        )
+        return dict(entry.result)
+
+    def put(self, embedding: Sequence[float], scope: str, result: Dict) -> None:
+        """
+        Store *result* under *embedding* within *scope*.
+
+        Args:
+            embedding: Query embedding (normalised here).
+            scope:     Scope key, see module docstring.
+            result:    Pipeline response dict to serve on later hits.
+        """
+        if not self.max_size:
+            return
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            scope_id = self._scope_index.setdefault(scope, len(self._scope_index))
+            slot = self._claim_slot(now)
+            self._vectors[slot] = vector
+            self._scope_ids[slot] = scope_id
+            self._expires[slot] = now + self.ttl
+            self._entries[slot] = CacheEntry(
+                result=dict(result), scope=scope, created_at=now
+            )
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._scope_ids.fill(-1)
+            self._entries.clear()
+            self._free_slots = list(range(self.max_size - 1, -1, -1))
+            self._scope_index.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Helpers ───────────────────────────────────────────────────────────────
+
+    def _claim_slot(self, now: float) -> int:
+        """Return a free slot, reclaiming expired or LRU entries if needed."""
+        if not self._free_slots:
+            expired = np.flatnonzero((self._scope_ids >= 0) & (self._expires <= now))
+            for slot in expired.tolist():
+                self._release(slot)
+        if not self._free_slots:
+            slot, _ = self._entries.popitem(last=False)
+            self._scope_ids[slot] = -1
+            self._free_slots.append(slot)
+        return self._free_slots.pop()
+
+    def _release(self, slot: int) -> None:
+        self._entries.pop(slot, None)
+        self._scope_ids[slot] = -1
+        self._free_slots.append(slot)
+
+    def _normalize(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape != (self._vectors.shape[1],):
+            return None
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+
+# Module-level singleton — import this in views / services.
+semantic_cache = SemanticCache()
@@ -0,0 +1,85 @@
+# rag/tasks.py
+from celery import shared_task
+import logging
+from typing import Optional
+
+import numpy as np
+from django.db import OperationalError
+
+from rag.models import QueryHistory
+
+logger = logging.getLogger(__name__)
+
+
+def _embedding_to_fp16(query_embedding: Optional[list]) -> Optional[bytes]:
+    """Pack an embedding as little-endian float16 bytes (768 B for 384 dims)."""
+    if query_embedding is None:
+        return None
+    return np.asarray(query_embedding, dtype="<f2").tobytes()
+
+
+@shared_task(ignore_result=True)
+def attach_query_embedding_task(query_history_id: int, query_embedding: list):
+    """
+    Celery task to store a query embedding on an existing QueryHistory row.
+
+    The embedding is the largest column of the audit record, so the request
+    path inserts the row without it and defers this UPDATE off the critical
+    path. It is stored as float16 bytes (768 B for 384 dims) — plenty for
+    later similarity diagnostics; read back with
+    ``np.frombuffer(value, dtype="<f2")``. A missing row (e.g. deleted chat)
+    is logged and ignored.
+    """
+    updated = QueryHistory.objects.filter(id=query_history_id).update(
+        query_embedding_fp16=_embedding_to_fp16(query_embedding)
+    )
+    if not updated:
+        logger.warning(
+            "QueryHistory row vanished before its embedding was attached.",
+            extra={"query_id": query_history_id},
+        )
+
+
+@shared_task(
+    ignore_result=True,
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def persist_query_history_task(fields: dict, query_embedding: Optional[list]):
+    """
+    Celery task to insert a QueryHistory row written behind the response.
+
+    ``fields`` are ``QueryHistory`` column values keyed by attribute name
+    (``user_id``/``chat_id`` for the foreign keys) and include the primary
+    key, which the request path drew from the table's sequence so it could
+    return ``query_id`` before the row exists. The embedding is stored in the
+    same INSERT. Transient database errors are retried with backoff.
+    """
+    QueryHistory.objects.create(
+        **fields, query_embedding_fp16=_embedding_to_fp16(query_embedding)
+    )
+
+
+@shared_task(ignore_result=True)
+def prewarm_chat_task(chat_id: int, user_id: int, seed_query: str):
+    """
+    Celery task to prefetch follow-up retrievals for a newly started chat.
+
+    See ``RAGQueryService.prewarm_chat``. Purely speculative, so failures
+    are logged and dropped rather than retried.
+    """
+    # Lazy imports: rag_query_service imports this module.
+    from rag.services.rag_query_service import rag_query_service
+    from users.models import User
+
+    user = User.objects.filter(id=user_id).first()
+    if user is None:
+        return
+    try:
+        rag_query_service.prewarm_chat(chat_id, user, seed_query)
+    except Exception as exc:
+        logger.warning(
+            "Chat prewarm failed.",
+            extra={"chat_id": chat_id, "error": str(exc)},
+        )
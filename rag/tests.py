@@ -1,3 +1,136 @@
-from django.test import TestCase
+from concurrent.futures import Future
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.db import OperationalError
+from django.test import SimpleTestCase
+
+from rag.serializers import QueryRequestSerializer, fast_validate_query
+from rag.services.inflight import InflightRequests
+from rag.services.rag_query_service import _dequantize_int8, _quantize_int8
+from rag.services.retrieval_batcher import RetrievalBatcher
+
+LEVELS = ("LOW", "MID")
+THRESHOLD = 0.45
+BAD_VECTOR = [9.0]
+
+
+def fake_retrieve_many(vectors, allowed_levels, threshold):
+    """Stand-in for ``_retrieve_many``; fails statements containing BAD_VECTOR."""
+    if BAD_VECTOR in vectors:
+        raise OperationalError("canceling statement due to statement timeout")
+    return [([], [], f"context {vector[0]}", 0) for vector in vectors]
+
+
+@mock.patch("rag.services.retrieval_batcher.close_old_connections")
+class RetrievalBatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.retrieve_many = mock.Mock(side_effect=fake_retrieve_many)
+        self.batcher = RetrievalBatcher(
+            self.retrieve_many, max_batch=32, max_wait_ms=5, concurrency=1
+        )
+
+    def test_one_failing_vector_does_not_fail_the_batch(self, _close):
+        requests = [
+            ([1.0], LEVELS, THRESHOLD),
+            (BAD_VECTOR, LEVELS, THRESHOLD),
+            ([2.0], LEVELS, THRESHOLD),
+        ]
+        batch = [(request, Future()) for request in requests]
+
+        self.batcher._dispatch(batch)
+
+        self.assertEqual(batch[0][1].result()[2], "context 1.0")
+        self.assertEqual(batch[2][1].result()[2], "context 2.0")
+        with self.assertRaises(OperationalError):
+            batch[1][1].result()
+        # One batched statement, then one retry per vector.
+        self.assertEqual(self.retrieve_many.call_count, 4)
+
+    def test_healthy_batch_runs_one_statement(self, _close):
+        requests = [([1.0], LEVELS, THRESHOLD), ([2.0], LEVELS, THRESHOLD)]
+
+        results = self.batcher._process(requests)
+
+        contexts = [result[2] for result in results]
+        self.assertEqual(contexts, ["context 1.0", "context 2.0"])
+        self.retrieve_many.assert_called_once()
+
+
+class FastValidateQueryTests(SimpleTestCase):
+    def test_valid_payload_is_cleaned(self):
+        self.assertEqual(
+            fast_validate_query({"query": "  What is X?  ", "mode": "quick"}),
+            ("What is X?", "quick"),
+        )
+
+    def test_defers_to_serializer_for_payloads_it_cannot_vouch_for(self):
+        payloads = [
+            ["not", "a", "mapping"],
+            {"query": "What is X?", "mode": ["quick"]},
+            {"query": "What is X?", "mode": {"quick": 1}},
+            {"query": "What\x00 is X?"},
+            {"query": "What is \ud83d?"},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertIsNone(fast_validate_query(payload))
+
+    def test_serializer_rejects_what_the_fast_path_defers(self):
+        payloads = [
+            {"query": "What is X?", "mode": ["quick"]},
+            {"query": "What\x00 is X?"},
+            {"query": "What is \ud83d?"},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertFalse(QueryRequestSerializer(data=payload).is_valid())
+
+
+class Int8QuantizationTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(384).astype(np.float32)
+        self.vector = vector / np.linalg.norm(vector)
+
+    def test_round_trip_preserves_direction(self):
+        packed = _quantize_int8(self.vector)
+        restored = _dequantize_int8(packed)
+
+        self.assertEqual(len(packed), 4 + 384)
+        self.assertEqual(restored.dtype, np.float32)
+        cosine = float(restored @ self.vector / np.linalg.norm(restored))
+        self.assertGreater(cosine, 0.999)
+
+    def test_round_trip_is_stable(self):
+        # Re-quantising a restored vector keeps it (fresh vs. Redis hit).
+        once = _dequantize_int8(_quantize_int8(self.vector))
+        twice = _dequantize_int8(_quantize_int8(once))
+        np.testing.assert_allclose(once, twice, rtol=1e-6, atol=0)
+
+    def test_zero_vector_and_read_only_result(self):
+        restored = _dequantize_int8(_quantize_int8(np.zeros(384, dtype=np.float32)))
+        self.assertFalse(restored.any())
+        self.assertFalse(restored.flags.writeable)
+
+
+class InflightKeyTests(SimpleTestCase):
+    def test_case_and_whitespace_variants_share_a_key(self):
+        key = InflightRequests.make_key("What is X?", "HIGH", "model-a")
+        for variant in ("what is x?", "  What   is\tX?  ", "WHAT IS X?"):
+            with self.subTest(variant=variant):
+                self.assertEqual(
+                    InflightRequests.make_key(variant, "HIGH", "model-a"), key
+                )
+
+    def test_scope_and_model_separate_keys(self):
+        key = InflightRequests.make_key("What is X?", "HIGH", "model-a")
+        self.assertNotEqual(
+            InflightRequests.make_key("What is X?", "LOW", "model-a"), key
+        )
+        self.assertNotEqual(
+            InflightRequests.make_key("What is X?", "HIGH", "model-b"), key
+        )
+        self.assertNotEqual(
+            InflightRequests.make_key("What is Y?", "HIGH", "model-a"), key
+        )
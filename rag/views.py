@@ -1,25 +1,143 @@
+import hashlib
 import logging
-
-from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import (
-    OpenApiExample,
-    OpenApiResponse,
-    extend_schema,
-    extend_schema_view,
-)
+import time
+
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition
+from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django.conf import settings
+from common.pagination import ChatMessageCursorPagination, HistoryCursorPagination
 from rag.models import Chat, QueryHistory
-from rag.services.rag_query_service import rag_query_service
-
-from .serializers import ChatSerializer, QueryRequestSerializer, QueryHistorySerializer
+from rag.schema import QUERY_POST_SCHEMA
+from rag.renderers import EventStreamRenderer, format_event
+from rag.services.access_control import get_user_allowed_security_levels
+from rag.services.inflight import inflight
+from rag.services.rag_query_service import embed_query, rag_query_service
+from rag.services.semantic_cache import semantic_cache
+from rag.tasks import prewarm_chat_task
+
+from .serializers import (
+    ChatSerializer,
+    QueryHistorySerializer,
+    QueryRequestSerializer,
+    fast_validate_query,
+)
 
 logger = logging.getLogger(__name__)
+# Maps the user-facing ``mode`` value to the underlying model identifier.
+# Add entries in settings.RESPONSE_MODE_MODELS when new models are registered
+# in LLMService; QueryRequestSerializer only accepts these keys.
 RESPONSE_MODE_MODELS = settings.RESPONSE_MODE_MODELS
 
-# Maps the user-facing ``mode`` value to the underlying model identifier.
-# Add entries here when new models are registered in LLMService.
+# Pipeline sources whose responses may be reused by the semantic cache.
+SEMANTIC_CACHEABLE_SOURCES = frozenset({"LLM", "EXTRACTIVE"})
+
+# Columns read by QueryHistorySerializer; everything else (notably the
+# embedding columns and the raw response metrics) stays in Postgres.
+QUERY_HISTORY_FIELDS = (
+    "id",
+    "query",
+    "response",
+    "response_source",
+    "created_at",
+    "security_level",
+    "is_flagged",
+    "retrieved_chunk_ids",
+    "user__email",
+)
+
+
+def query_history_queryset(**filters):
+    """
+    ``QueryHistory`` rows matching *filters*, shaped for the serializer.
+
+    ``username`` is joined in the same query (no per-row user lookup) and
+    only the serialized columns are selected.
+    """
+    return (
+        QueryHistory.objects
+        .filter(**filters)
+        .select_related("user")
+        .only(*QUERY_HISTORY_FIELDS)
+    )
+
+
+def query_history_rows(**filters):
+    """
+    Plain-dict rows in ``QueryHistorySerializer``'s output shape.
+
+    Used by the read-only list endpoints: building dicts straight from
+    ``.values()`` skips the per-field ``ModelSerializer`` machinery, which
+    dominates response time on long histories.
+    """
+    return QueryHistory.objects.filter(**filters).values(
+        "id",
+        "query",
+        "response",
+        "response_source",
+        "created_at",
+        "security_level",
+        "is_flagged",
+        username=F("user__email"),
+        sources=F("retrieved_chunk_ids"),
+    )
+
+
+def finalize_history_rows(rows) -> list:
+    """
+    Apply the serializer's edge cases to a page of ``query_history_rows``.
+
+    ``QueryHistorySerializer`` omits ``username`` for rows without a user
+    and renders empty ``sources`` as ``[]``; the plain rows match that.
+    """
+    page = []
+    for row in rows:
+        if row["username"] is None:
+            del row["username"]
+        row["sources"] = row["sources"] or []
+        page.append(row)
+    return page
+
+
+def history_etag(request, **filters) -> str:
+    """
+    Weak ETag for a history listing: newest row, row count and the URL.
+
+    One aggregate over the (user|chat, created_at) index; any insert or
+    delete changes it, and the full path keeps pages and cursors apart.
+    """
+    stats = QueryHistory.objects.filter(**filters).aggregate(
+        latest=Max("created_at"), count=Count("id")
+    )
+    raw = f"{stats['latest']}|{stats['count']}|{request.get_full_path()}"
+    return 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def _user_history_etag(request, *args, **kwargs) -> str:
+    return history_etag(request, user=request.user)
+
+
+def _chat_history_etag(request, *args, **kwargs) -> str:
+    chat_id = kwargs.get("id") or kwargs.get("chat_id")
+    return history_etag(request, chat_id=chat_id, chat__user=request.user)
+
+
+# Polled listings: answer unchanged repeats with 304 and let the client
+# reuse its copy briefly. They are also the only gzipped responses: auth and
+# password-reset bodies mix secrets with client input (BREACH), so
+# compression is opted into per view, never site-wide.
+_history_cache_control = cache_control(private=True, max_age=5)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Chat Management Endpoints
 # ──────────────────────────────────────────────────────────────────────────────
@@ -70,11 +188,20 @@ class ChatDestroyView(generics.DestroyAPIView):
     get=extend_schema(summary="View Chat History", tags=["RAG Messages"]),
     post=extend_schema(summary="Ask a Question (Triggers RAG)", tags=["RAG Messages"])
 )
+@method_decorator(gzip_page, name="get")
+@method_decorator(_history_cache_control, name="get")
+@method_decorator(condition(etag_func=_chat_history_etag), name="get")
 class ChatMessageView(generics.GenericAPIView):
     """
     Handle viewing messages and submitting new RAG queries for a specific chat.
+
+    A POST with ``Accept: text/event-stream`` streams the answer as
+    server-sent events (``{"token": ...}`` per fragment, then a final
+    ``{"done": ...}`` event with ``query_id`` and ``sources``); any other
+    client gets the buffered JSON response.
     """
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -97,45 +224,117 @@ class ChatMessageView(generics.GenericAPIView):
             }
         )
         
-        return get_object_or_404(
-            Chat,
-            id=chat_id,
-            user=self.request.user,
-            is_deleted=False   
+        # Only the columns the message endpoints read; ownership is checked
+        # in the WHERE clause so another user's chat is a plain 404.
+        chat = (
+            Chat.objects
+            .only("id", "title", "user_id")
+            .filter(id=chat_id, user=self.request.user, is_deleted=False)
+            .first()
+        )
+        if chat is None:
+            raise Http404("Chat not found.")
+        return chat
+
+    def _prewarm_chat(self, chat, query_text: str) -> None:
+        """
+        Queue a prefetch of likely follow-up retrievals for a new chat.
+
+        The first message of a chat is a strong hint that a follow-up is
+        coming; see ``RAGQueryService.prewarm_chat``.
+        """
+        user_id = self.request.user.id
+
+        def enqueue() -> None:
+            try:
+                prewarm_chat_task.delay(chat.id, user_id, query_text)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to enqueue chat prewarm.",
+                    extra={"chat_id": chat.id, "error": str(exc)},
+                )
+
+        transaction.on_commit(enqueue)
+
+    @staticmethod
+    def _update_chat(chat, title: str, touch: bool) -> None:
+        """
+        Apply the post-query chat changes in one UPDATE, without a model save.
+
+        Args:
+            chat:  The chat the query was asked in.
+            title: Title to set if the chat has none yet (its first message).
+            touch: Whether to bump ``updated_at`` (successful answers only).
+        """
+        updates = {}
+        if not chat.title:
+            updates["title"] = title
+        if touch:
+            updates["updated_at"] = timezone.now()
+        if updates:
+            Chat.objects.filter(id=chat.id).update(**updates)
+
+    def _stream_answer(self, chat, title: str, query_text: str, model_name: str):
+        """Return the answer as a server-sent events stream."""
+        user = self.request.user
+
+        def events():
+            done = False
+            for event in rag_query_service.stream_events(
+                query_text=query_text,
+                user=user,
+                model_name=model_name,
+                chat_session=chat,
+            ):
+                done = event.get("done", done)
+                yield format_event(event)
+            self._update_chat(chat, title, touch=done)
+            if not chat.title:
+                self._prewarm_chat(chat, query_text)
+
+        response = StreamingHttpResponse(
+            events(), content_type=EventStreamRenderer.media_type
         )
+        response["Cache-Control"] = "no-cache"
+        # Stop nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
 
     def get(self, request, *args, **kwargs):
         """View History: Returns list of Q&A pairs for this chat."""
         chat = self.get_chat_object()
         
-        messages = QueryHistory.objects.filter(
-            chat=chat 
-        ).order_by("created_at")
-        
-        serializer = self.get_serializer(messages, many=True)
-        return Response(serializer.data)
+        messages = query_history_rows(chat=chat)
+        paginator = ChatMessageCursorPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        return paginator.get_paginated_response(finalize_history_rows(page))
 
     def post(self, request, *args, **kwargs):
         """Ask a Question: Runs secure RAG pipeline and saves to this chat."""
         chat = self.get_chat_object()
         
-        serializer = self.get_serializer(data=request.data)
-        if not serializer.is_valid():
-            logger.warning(
-                "Query validation failed.",
-                extra={"user_id": request.user.id, "errors": serializer.errors}
+        payload = fast_validate_query(request.data)
+        if payload is None:
+            serializer = self.get_serializer(data=request.data)
+            if not serializer.is_valid():
+                logger.warning(
+                    "Query validation failed.",
+                    extra={"user_id": request.user.id, "errors": serializer.errors}
+                )
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            payload = (
+                serializer.validated_data["query"],
+                serializer.validated_data["mode"],
             )
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        validated = serializer.validated_data
-        query_text = validated["query"]
-        mode = validated.get("mode", "quick")
-        model_name = RESPONSE_MODE_MODELS.get(mode, settings.LLM_DEFAULT_MODEL)
+        query_text, mode = payload
+        model_name = RESPONSE_MODE_MODELS[mode]
 
-        # Auto-update chat title if it's the first message
-        if not chat.title:
-            chat.title = query_text[:50].strip()
-            chat.save(update_fields=["title"])
+        # Auto-title the chat from its first message
+        title = query_text[:50].strip()
+
+        if request.accepted_renderer.format == EventStreamRenderer.format:
+            return self._stream_answer(chat, title, query_text, model_name)
 
         try:
             result = rag_query_service.query(
@@ -154,14 +353,15 @@ class ChatMessageView(generics.GenericAPIView):
                 },
                 exc_info=True,
             )
+            self._update_chat(chat, title, touch=False)
             return Response(
                 {"error": "Internal server error", "details": str(exc)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        # Update chat timestamp
-        if result.get("success"):
-            chat.save(update_fields=["updated_at"])
+        self._update_chat(chat, title, touch=bool(result.get("success")))
+        if not chat.title:
+            self._prewarm_chat(chat, query_text)
 
         http_status = (
             status.HTTP_200_OK 
@@ -187,101 +387,70 @@ class QueryView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = QueryRequestSerializer
 
-    @extend_schema(
-        summary="Submit a RAG query",
-        description=(
-            "Embeds the query, retrieves relevant document chunks within the "
-            "user's security clearance, and returns a generated answer. "
-            "Use `mode=quick` (default) for the smaller, faster model or "
-            "`mode=detailed` for the larger, more thorough model."
-        ),
-        responses={
-            200: OpenApiResponse(
-                description="Query processed successfully (answer may be extractive if LLM unavailable).",
-                examples=[
-                    OpenApiExample(
-                        "LLM answer",
-                        value={
-                            "success": True,
-                            "query_id": 42,
-                            "answer": "The Q3 revenue was $4.2 million.",
-                            "source": "LLM",
-                            "model": "Qwen/Qwen2-0.5B-Instruct",
-                            "chunks_used": 3,
-                            "latency_ms": 812,
-                            "token_count": 11,
-                            "sources": [
-                                {
-                                    "chunk_id": 7,
-                                    "document_id": 2,
-                                    "document_title": "Q3 Financial Report",
-                                    "chunk_index": 4,
-                                }
-                            ],
-                        },
-                    ),
-                    OpenApiExample(
-                        "No results",
-                        value={
-                            "success": True,
-                            "query_id": 43,
-                            "answer": "I could not find any relevant information to answer your question.",
-                            "source": "NO_RESULTS",
-                            "model": None,
-                            "chunks_used": 0,
-                            "latency_ms": 54,
-                            "sources": [],
-                        },
-                    ),
-                ],
-            ),
-            400: OpenApiResponse(description="Invalid request body (validation error)."),
-            401: OpenApiResponse(description="Authentication credentials not provided."),
-            500: OpenApiResponse(
-                description="Unexpected server error.",
-                examples=[
-                    OpenApiExample(
-                        "Internal error",
-                        value={"error": "Internal server error", "details": "..."},
-                    )
-                ],
-            ),
-        },
-        tags=["RAG"],
-    )
+    @extend_schema(**QUERY_POST_SCHEMA)
     def post(self, request):
-        serializer = self.get_serializer(data=request.data)
-        if not serializer.is_valid():
-            logger.warning(
-                "Query request validation failed.",
-                extra={
-                    "user_id": request.user.id,
-                    "errors": serializer.errors,
-                },
+        # The serializer only runs (for its error messages) when the fast
+        # path rejects the payload; it stays the schema source either way.
+        payload = fast_validate_query(request.data)
+        if payload is None:
+            serializer = self.get_serializer(data=request.data)
+            if not serializer.is_valid():
+                logger.warning(
+                    "Query request validation failed.",
+                    extra={
+                        "user_id": request.user.id,
+                        "errors": serializer.errors,
+                    },
+                )
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            payload = (
+                serializer.validated_data["query"],
+                serializer.validated_data["mode"],
             )
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        validated = serializer.validated_data
-        query_text = validated["query"]
-        mode = validated.get("mode", "quick")
-        model_name = RESPONSE_MODE_MODELS.get(mode, RESPONSE_MODE_MODELS["quick"])
+        query_text, mode = payload
+        model_name = RESPONSE_MODE_MODELS[mode]
 
-        logger.info(
-            "RAG query received.",
-            extra={
-                "user_id": request.user.id,
-                "mode": mode,
-                "model_name": model_name,
-                "query_preview": query_text[:100],
-            },
+        # ── Semantic cache: serve near-duplicate queries without the pipeline ─
+        start_ns = time.perf_counter_ns()
+        _, effective_max_level = get_user_allowed_security_levels(request.user)
+        cache_scope = f"{effective_max_level}:{model_name}"
+        query_embedding, cached = self._semantic_lookup(
+            request, query_text, cache_scope
         )
 
-        try:
-            result = rag_query_service.query(
-                query_text=query_text,
+        if cached is not None:
+            result = rag_query_service.record_cached_response(
                 user=request.user,
-                model_name=model_name,
+                query_text=query_text,
+                query_embedding=query_embedding,
+                cached=cached,
+                effective_max_level=effective_max_level,
+                start_ns=start_ns,
+            )
+            self._log_dispatch(request, mode, model_name, query_text, result, 200)
+            return Response(result, status=status.HTTP_200_OK)
+
+        # ── Single-flight: identical concurrent queries share one pipeline run ─
+        inflight_key = inflight.make_key(query_text, effective_max_level, model_name)
+        try:
+            result, is_leader = inflight.run(
+                inflight_key,
+                lambda: rag_query_service.query(
+                    query_text=query_text,
+                    user=request.user,
+                    model_name=model_name,
+                ),
             )
+            if not is_leader:
+                result = self._follower_result(
+                    request,
+                    result,
+                    query_text,
+                    query_embedding,
+                    effective_max_level,
+                    start_ns,
+                )
         except Exception as exc:
             # The service should not raise (it returns success=False on errors),
             # but guard here so an unexpected bug never leaks a 500 without a log.
@@ -295,16 +464,88 @@ class QueryView(generics.GenericAPIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        if (
+            query_embedding is not None
+            and is_leader
+            and result.get("success")
+            and result.get("source") in SEMANTIC_CACHEABLE_SOURCES
+        ):
+            semantic_cache.put(query_embedding, cache_scope, result)
+
         http_status = (
             status.HTTP_200_OK
             if result.get("success")
             else status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+        self._log_dispatch(request, mode, model_name, query_text, result, http_status)
+        return Response(result, status=http_status)
+
+    @staticmethod
+    def _semantic_lookup(request, query_text, cache_scope):
+        """
+        Embed *query_text* and probe the semantic cache.
+
+        Returns:
+            ``(query_embedding, cached)`` — either may be ``None``; a failed
+            lookup is logged and treated as a miss.
+        """
+        try:
+            # Memoised, so the pipeline's own embed_query call is free.
+            query_embedding = embed_query(query_text)
+            return query_embedding, semantic_cache.get(query_embedding, cache_scope)
+        except Exception as exc:
+            logger.warning(
+                "Semantic cache lookup failed — running full pipeline.",
+                extra={"user_id": request.user.id, "error": str(exc)},
+            )
+            return None, None
+
+    @staticmethod
+    def _follower_result(
+        request, result, query_text, query_embedding, effective_max_level, start_ns
+    ):
+        """
+        Re-stamp a coalesced leader's *result* for this request's user.
+
+        Each user still gets their own audit row and ``query_id``: answers are
+        recorded as ``COALESCED`` rows, failures as the follower's own ERROR row.
+        """
+        if result.get("success"):
+            return rag_query_service.record_cached_response(
+                user=request.user,
+                query_text=query_text,
+                query_embedding=query_embedding,
+                cached=result,
+                effective_max_level=effective_max_level,
+                start_ns=start_ns,
+                source="COALESCED",
+            )
+        return rag_query_service.record_coalesced_failure(
+            user=request.user,
+            query_text=query_text,
+            failed=result,
+            effective_max_level=effective_max_level,
+            start_ns=start_ns,
+        )
+
+    @staticmethod
+    def _log_dispatch(request, mode, model_name, query_text, result, http_status):
+        """
+        Emit the request's single structured INFO event.
+
+        One event per request instead of one per stage; the ``extra`` dict
+        (and the query preview slice) is only built when INFO is enabled.
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             "RAG query response dispatched.",
             extra={
                 "user_id": request.user.id,
+                "mode": mode,
+                "model_name": model_name,
+                "query_preview": query_text[:100],
                 "query_id": result.get("query_id"),
                 "success": result.get("success"),
                 "source": result.get("source"),
@@ -312,7 +553,6 @@ class QueryView(generics.GenericAPIView):
                 "http_status": http_status,
             },
         )
-        return Response(result, status=http_status)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -333,28 +573,35 @@ class QueryView(generics.GenericAPIView):
         tags=["RAG"],
     )
 )
+@method_decorator(gzip_page, name="get")
+@method_decorator(_history_cache_control, name="get")
+@method_decorator(condition(etag_func=_user_history_etag), name="get")
 class QueryHistoryView(generics.ListAPIView):
     """
     List the authenticated user's RAG query history.
 
-    Results are ordered by ``created_at`` descending (most recent first).
+    Results are ordered by ``created_at`` descending (most recent first) and
+    cursor-paginated; follow ``next`` / ``previous`` to page.
     Only the requesting user's own records are ever returned — there is no
     way to access another user's history through this endpoint.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    # Documents the response schema; rows are built by ``query_history_rows``.
     serializer_class = QueryHistorySerializer
+    pagination_class = HistoryCursorPagination
 
     def get_queryset(self):
         logger.debug(
             "Fetching query history.",
             extra={"user_id": self.request.user.id},
         )
-        return (
-            QueryHistory.objects
-            .filter(user=self.request.user)
-            .order_by("-created_at")
-        )
+        # Ordering is applied by the paginator.
+        return query_history_rows(user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(finalize_history_rows(page))
 
 
 @extend_schema_view(
@@ -393,4 +640,4 @@ class QueryDetailView(generics.RetrieveAPIView):
                 "query_id": self.kwargs.get("id"),
             },
         )
-        return QueryHistory.objects.filter(user=self.request.user)
\ No newline at end of file
+        return query_history_queryset(user=self.request.user)
\ No newline at end of file
@@ -3,13 +3,12 @@ from django.contrib import admin
 from .models import User
 
 
-
-
-# Register your models here.
-class UserAdmin(User):
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
     list_display = ("email", "full_name", "is_staff")
     search_fields = ("email", "full_name")
+    search_help_text = "Search by (part of) email or full name."
     ordering = ("email",)
-
-
-admin.site.register(User)
+    list_per_page = 50
+    # Skip the unfiltered "N total" COUNT(*) on every changelist page.
+    show_full_result_count = False
@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-15 23:55
+
+from django.db import migrations, models
+
+# Old CharField values → IntegerChoices codes (see User.Role).
+ROLE_CODES = {
+    "GUEST": 0,
+    "EMPLOYEE": 1,
+    "MANAGER": 2,
+    "CEO": 3,
+    "VICE_PRESIDENT": 4,
+}
+
+ROLE_CHOICES = [
+    (0, "Guest"),
+    (1, "Employee"),
+    (2, "Manager"),
+    (3, "CEO"),
+    (4, "Vice President"),
+]
+
+
+def role_names_to_codes(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    for name, code in ROLE_CODES.items():
+        User.objects.filter(role=name).update(role_code=code)
+
+
+def role_codes_to_names(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    for name, code in ROLE_CODES.items():
+        User.objects.filter(role_code=code).update(role=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_role_email_lower_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_role_idx",
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="role_code",
+            field=models.SmallIntegerField(choices=ROLE_CHOICES, default=0),
+        ),
+        migrations.RunPython(role_names_to_codes, role_codes_to_names),
+        migrations.RemoveField(
+            model_name="user",
+            name="role",
+        ),
+        migrations.RenameField(
+            model_name="user",
+            old_name="role_code",
+            new_name="role",
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["role"], name="user_role_idx"),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-16 09:10
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    clashes = list(
+        User.objects.values(email_lower=Lower("email"))
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("email_lower", flat=True)
+    )
+    if clashes:
+        raise RuntimeError(
+            "Cannot make emails case-insensitively unique; merge or rename "
+            f"these accounts first: {sorted(clashes)}"
+        )
+    User.objects.exclude(email=Lower("email")).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_role_smallint"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_email_lower_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="user_email_lower_uniq",
+                violation_error_message="A user with this email already exists.",
+            ),
+        ),
+    ]
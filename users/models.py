@@ -1,13 +1,21 @@
 # app/models.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Lower, Upper
 
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("Users must have an email address")
-        email = self.normalize_email(email)
+        # Store addresses fully lower-cased, matching ``user_email_lower_uniq``;
+        # normalize_email only lower-cases the domain part.
+        email = self.normalize_email(email).lower()
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
@@ -21,18 +29,61 @@ class UserManager(BaseUserManager):
             extra_fields.setdefault("role", User.Role.CEO)
         return self.create_user(email, password, **extra_fields)
 
+    def create_users_bulk(self, rows, batch_size=500):
+        """
+        Create many users with one INSERT per ``batch_size`` rows.
+
+        Passwords are hashed concurrently in threads: the Argon2 and
+        PBKDF2 hashers run in C and release the GIL. Rows whose email
+        already exists are skipped.
+
+        Args:
+            rows:       Dicts with ``email``, optional ``password`` and optional
+                        ``extra`` (further model field values).
+            batch_size: Rows per INSERT statement.
+
+        Returns:
+            The unsaved-pk ``User`` instances passed to ``bulk_create``.
+        """
+        rows = list(rows)
+        for row in rows:
+            if not row.get("email"):
+                raise ValueError("Users must have an email address")
+
+        # make_password(None) yields an unusable password, like set_password.
+        passwords = [row.get("password") for row in rows]
+        with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1)) as pool:
+            hashes = list(pool.map(make_password, passwords))
+
+        users = [
+            self.model(
+                email=self.normalize_email(row["email"]).lower(),
+                password=password_hash,
+                **row.get("extra", {}),
+            )
+            for row, password_hash in zip(rows, hashes)
+        ]
+        return self.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+
+    def get_by_natural_key(self, username):
+        # Case-insensitive login lookup; ``user_email_lower_uniq`` serves it and
+        # guarantees at most one match.
+        return self.alias(email_lower=Lower("email")).get(email_lower=username.lower())
+
 
 class User(AbstractBaseUser, PermissionsMixin):
-    class Role(models.TextChoices):
-        GUEST          = "GUEST",          "Guest"
-        EMPLOYEE       = "EMPLOYEE",       "Employee"
-        MANAGER        = "MANAGER",        "Manager"
-        CEO            = "CEO",            "CEO"
-        VICE_PRESIDENT = "VICE_PRESIDENT", "Vice President"
+    # Stored as a 2-byte code; the API exposes the member name (see
+    # ``users.serializers.RoleField``). Never renumber existing members.
+    class Role(models.IntegerChoices):
+        GUEST          = 0, "Guest"
+        EMPLOYEE       = 1, "Employee"
+        MANAGER        = 2, "Manager"
+        CEO            = 3, "CEO"
+        VICE_PRESIDENT = 4, "Vice President"
 
     email      = models.EmailField(unique=True)
     full_name  = models.CharField(max_length=150, blank=True)
-    role       = models.CharField(max_length=20, choices=Role.choices, default=Role.GUEST)
+    role       = models.SmallIntegerField(choices=Role.choices, default=Role.GUEST)
     department = models.CharField(max_length=100, blank=True)
     is_active  = models.BooleanField(default=True)
     is_staff   = models.BooleanField(default=False)
@@ -48,6 +99,28 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["role"], name="user_role_idx"),
+            # Trigram indexes for the admin's icontains search, which Postgres
+            # runs as UPPER(col) LIKE UPPER('%q%').
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="users_user_email_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("full_name"), name="gin_trgm_ops"),
+                name="users_user_full_name_trgm",
+            ),
+        ]
+        constraints = [
+            # Emails are unique regardless of case; also the index behind
+            # case-insensitive login (``UserManager.get_by_natural_key``).
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_lower_uniq",
+                violation_error_message="A user with this email already exists.",
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.email} ({self.role})"
\ No newline at end of file
+        return f"{self.email} ({self.Role(self.role).name})"
@@ -1,6 +1,12 @@
 
 from rest_framework import permissions
 
+from .models import User
+
+# Roles with user-management rights, besides staff accounts.
+_ADMIN_ROLES = frozenset({User.Role.CEO.value, User.Role.VICE_PRESIDENT.value})
+
+
 class IsAdminOrManager(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.role in ["CEO", "VICE_PRESIDENT"] or request.user.is_staff
\ No newline at end of file
+        return request.user.is_staff or request.user.role in _ADMIN_ROLES
@@ -1,19 +1,76 @@
+import re
+from typing import Optional
+
 from rest_framework import serializers
 import logging
 from utils.get_client_ip import get_client_ip
 from .models import User
 from django.conf import settings
-from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
-from django.utils.http import urlsafe_base64_decode
-from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from .tasks import send_password_reset_email_task
+from .tokens import password_reset_token_generator
 
 
 logger = logging.getLogger("user_activity")
 
+# Base64url of a bigint primary key (at most 19 digits → 26 characters).
+_UIDB64_RE = re.compile(r"^[A-Za-z0-9_\-=]{1,27}$")
+_MAX_PK = 2**63 - 1
+
+
+def _decode_uid(uidb64: str) -> Optional[int]:
+    """Return the primary key encoded in *uidb64*, or ``None`` if malformed."""
+    if not _UIDB64_RE.match(uidb64):
+        return None
+    try:
+        raw = urlsafe_base64_decode(uidb64)
+    except ValueError:
+        return None
+    if not raw.isdigit():
+        return None
+    pk = int(raw)
+    return pk if pk <= _MAX_PK else None
+
+class RoleField(serializers.ChoiceField):
+    """``User.role`` exposed by member name ("CEO"), stored as its int code."""
+
+    def __init__(self, **kwargs):
+        choices = [(role.name, role.label) for role in User.Role]
+        super().__init__(choices=choices, **kwargs)
+
+    def to_internal_value(self, data):
+        return User.Role[super().to_internal_value(data)]
+
+    def to_representation(self, value):
+        if value in ("", None):
+            return value
+        return User.Role(value).name
+
+
+def _validate_email_available(serializer, value):
+    """Lower-case *value* and reject it if another user has it in any case."""
+    value = value.lower()
+    others = User.objects.alias(email_lower=Lower("email")).filter(email_lower=value)
+    if serializer.instance is not None:
+        others = others.exclude(pk=serializer.instance.pk)
+    if others.exists():
+        raise serializers.ValidationError("A user with this email already exists.")
+    return value
+
+
 class UserSerializer(serializers.ModelSerializer):
+    role = RoleField(required=False)
+
+    def validate_email(self, value):
+        return _validate_email_available(self, value)
+
     class Meta:
         model = User
         fields = (
@@ -25,11 +82,15 @@ class UserSerializer(serializers.ModelSerializer):
             "is_active",
             "created_at",
             "updated_at",
-
         )
-        extra_kwargs = {"password": {"write_only": True}}
+        read_only_fields = ("id", "created_at", "updated_at")
 
 class UserUpdateSerializer(serializers.ModelSerializer):
+    role = RoleField(required=False)
+
+    def validate_email(self, value):
+        return _validate_email_available(self, value)
+
     class Meta:
         model = User
         fields = (
@@ -39,31 +100,68 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             "department",
             "is_active",
         )
-        extra_kwargs = {"password": {"write_only": True}}
-
-        def update(self, instance, validated_data):
-            for attr, value in validated_data.items():
-                setattr(instance, attr, value)
-            instance.save()
-            request = self.context.get("request")
-            if request:
-                ip = get_client_ip(request)
-                logger.info(f"User updated: {instance.email} from IP: {ip}")
-            return instance
-        
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Write only the submitted columns (plus the auto_now timestamp).
+        instance.save(update_fields=[*validated_data.keys(), "updated_at"])
+        request = self.context.get("request")
+        if request:
+            ip = get_client_ip(request)
+            logger.info("User updated: %s from IP: %s", instance.email, ip)
+        return instance
+
 class PasswordResetSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
     def save(self, request):
+        """
+        Queue a reset link for the active account for ``email``, if any.
+
+        The mail is sent by ``send_password_reset_email_task`` after the
+        transaction commits, so SMTP latency stays off the request.
+
+        Returns:
+            The user the link was sent to, or ``None`` — callers must not
+            reveal which to the client.
+        """
         email = self.validated_data["email"]
-        opts = {
+        # Only the columns the token hash and the email template read.
+        user = (
+            User.objects.alias(email_lower=Lower("email"))
+            .filter(email_lower=email.lower(), is_active=True)
+            .only("id", "email", "password", "last_login")
+            .first()
+        )
+        if user is None or not user.has_usable_password():
+            return None
+
+        current_site = get_current_site(request)
+        task_kwargs = {
+            "user_id": user.pk,
+            "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+            "token": password_reset_token_generator.make_token(user),
+            "domain": current_site.domain,
+            "site_name": current_site.name,
             "use_https": request.is_secure(),
             "from_email": settings.DEFAULT_FROM_EMAIL,
-            "request": request,
         }
-        form = PasswordResetForm(data=self.validated_data)
-        if form.is_valid():
-            form.save(**opts)
+
+        def enqueue() -> None:
+            # Never let a broker outage surface as a 500: it would only
+            # happen for registered emails and so reveal which ones exist.
+            try:
+                send_password_reset_email_task.delay(**task_kwargs)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to enqueue password reset email for user %s: %s",
+                    user.pk,
+                    exc,
+                )
+
+        transaction.on_commit(enqueue)
+        return user
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
     uid = serializers.CharField()
@@ -75,19 +173,36 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         token = attrs["token"]
         new_password = attrs["new_password"]
 
-        try:
-            uid = urlsafe_base64_decode(uid).decode()
-            user = get_user_model().objects.get(pk=uid)
-        except (TypeError, ValueError, OverflowError, get_user_model().DoesNotExist):
-            raise serializers.ValidationError("Invalid reset link.")
+        # Unknown uids, bad tokens and weak passwords all run the same
+        # lookup, token check and password validation, so response time
+        # does not reveal which uids belong to real accounts.
+        pk = _decode_uid(uid)
+        user = None
+        if pk is not None:
+            # Columns read by the token hash, the password validators and save().
+            user = (
+                get_user_model()
+                .objects.filter(pk=pk)
+                .only("id", "email", "password", "last_login")
+                .first()
+            )
+        uid_valid = user is not None
+        if user is None:
+            user = get_user_model()(is_active=False)
+
+        token_valid = password_reset_token_generator.check_token(user, token)
 
         try:
             validate_password(new_password, user=user)
+            password_errors = None
         except ValidationError as e:
-            raise serializers.ValidationError({"new_password": e.messages})
+            password_errors = e.messages
 
-        if not default_token_generator.check_token(user, token):
-            raise serializers.ValidationError("Invalid or expired token.")
+        # Non-short-circuiting so both results are always evaluated.
+        if not (uid_valid & token_valid):
+            raise serializers.ValidationError("Invalid reset link.")
+        if password_errors:
+            raise serializers.ValidationError({"new_password": password_errors})
 
         attrs["user"] = user
         return attrs
@@ -95,5 +210,7 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
     def save(self):
         user = self.validated_data["user"]
         user.set_password(self.validated_data["new_password"])
-        user.save()
+        # The user was loaded with only(); name the columns so the auto_now
+        # updated_at (not loaded) is written too.
+        user.save(update_fields=["password", "updated_at"])
         return user
\ No newline at end of file
@@ -0,0 +1,50 @@
+# users/tasks.py
+import logging
+
+from celery import shared_task
+from django.contrib.auth.forms import PasswordResetForm
+
+from .models import User
+
+logger = logging.getLogger("user_activity")
+
+
+@shared_task(ignore_result=True)
+def send_password_reset_email_task(
+    user_id: int,
+    uid: str,
+    token: str,
+    domain: str,
+    site_name: str,
+    use_https: bool,
+    from_email: str,
+):
+    """
+    Celery task to mail a password-reset link outside the request cycle.
+
+    The uid and token are generated by the request, so the link matches
+    what ``PasswordResetForm.save`` would have sent; this task only renders
+    Django's reset templates and talks to SMTP. A user deactivated or
+    deleted in the meantime gets no mail.
+    """
+    user = User.objects.filter(pk=user_id, is_active=True).only("id", "email").first()
+    if user is None:
+        logger.warning("Password reset requested for an unavailable user: %s", user_id)
+        return
+
+    context = {
+        "email": user.email,
+        "domain": domain,
+        "site_name": site_name,
+        "uid": uid,
+        "user": user,
+        "token": token,
+        "protocol": "https" if use_https else "http",
+    }
+    PasswordResetForm().send_mail(
+        "registration/password_reset_subject.txt",
+        "registration/password_reset_email.html",
+        context,
+        from_email,
+        user.email,
+    )
@@ -1,3 +1,91 @@
-from django.test import TestCase
+from datetime import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from .models import User
+from .serializers import RoleField
+from .tokens import CachedKeyTokenGenerator
+
+
+class PasswordResetRequestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("password-reset")
+        User.objects.create_user(email="alice@example.com", password="S3cure-pass!")
+
+    @mock.patch("users.serializers.send_password_reset_email_task.delay")
+    def test_broker_failure_still_returns_generic_200(self, delay):
+        delay.side_effect = ConnectionRefusedError("broker unreachable")
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(self.url, {"email": "alice@example.com"})
+        unknown = self.client.post(self.url, {"email": "nobody@example.com"})
+
+        self.assertEqual(len(callbacks), 1)
+        delay.assert_called_once()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["detail"], unknown.data["detail"])
+
+
+def _unsaved_user():
+    return User(
+        pk=42,
+        email="alice@example.com",
+        password="argon2$argon2id$v=19$m=102400,t=2,p=8$c2FsdA$aGFzaA",
+    )
+
+
+@mock.patch.object(
+    PasswordResetTokenGenerator, "_now", return_value=datetime(2026, 10, 15, 12, 0)
+)
+class CachedKeyTokenGeneratorTests(SimpleTestCase):
+    def test_tokens_match_djangos_generator(self, _now):
+        user = _unsaved_user()
+        expected = PasswordResetTokenGenerator().make_token(user)
+
+        generator = CachedKeyTokenGenerator()
+        self.assertEqual(generator.make_token(user), expected)
+        # Second call goes through the cached keyed HMAC.
+        self.assertEqual(generator.make_token(user), expected)
+        self.assertTrue(generator.check_token(user, expected))
+
+    def test_check_token_accepts_secret_key_fallbacks(self, _now):
+        user = _unsaved_user()
+        with override_settings(SECRET_KEY="old-secret-key"):
+            token = CachedKeyTokenGenerator().make_token(user)
+
+        with override_settings(
+            SECRET_KEY="new-secret-key", SECRET_KEY_FALLBACKS=["old-secret-key"]
+        ):
+            self.assertTrue(CachedKeyTokenGenerator().check_token(user, token))
+        with override_settings(SECRET_KEY="new-secret-key", SECRET_KEY_FALLBACKS=[]):
+            self.assertFalse(CachedKeyTokenGenerator().check_token(user, token))
+
+
+class RoleFieldTests(SimpleTestCase):
+    def test_names_map_to_codes_and_back(self):
+        field = RoleField()
+        for role in User.Role:
+            with self.subTest(role=role.name):
+                code = field.to_internal_value(role.name)
+                self.assertEqual(code, role.value)
+                self.assertEqual(field.to_representation(code), role.name)
+
+    def test_codes_are_stable(self):
+        # Stored in users_user.role; renumbering would corrupt existing rows.
+        self.assertEqual(
+            {role.name: role.value for role in User.Role},
+            {"GUEST": 0, "EMPLOYEE": 1, "MANAGER": 2, "CEO": 3, "VICE_PRESIDENT": 4},
+        )
+
+    def test_rejects_labels_codes_and_unknown_names(self):
+        field = RoleField()
+        for value in ("Vice President", 3, "3", "OWNER"):
+            with self.subTest(value=value):
+                with self.assertRaises(serializers.ValidationError):
+                    field.to_internal_value(value)
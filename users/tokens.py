@@ -0,0 +1,49 @@
+"""
+Password-reset token generator with a reusable keyed HMAC.
+
+Django's ``PasswordResetTokenGenerator`` calls ``salted_hmac`` for every
+token it makes or checks, which hashes ``key_salt + secret`` into a fresh
+key and sets up a new HMAC each time.  The key only depends on the secret,
+so ``CachedKeyTokenGenerator`` builds one keyed HMAC per secret
+(``SECRET_KEY`` and each of ``SECRET_KEY_FALLBACKS``) and ``copy()``s it per
+token.  Tokens are byte-for-byte identical to Django's default generator.
+
+The digest itself runs in OpenSSL via ``hashlib``; builds linked against an
+OpenSSL with SHA extensions (SHA-NI) get the hardware-accelerated path.
+"""
+
+import hashlib
+import hmac
+from typing import Dict
+
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.utils.encoding import force_bytes
+from django.utils.http import int_to_base36
+
+
+class CachedKeyTokenGenerator(PasswordResetTokenGenerator):
+    """``PasswordResetTokenGenerator`` that reuses its keyed HMAC per secret."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._hmac_templates: Dict[str, "hmac.HMAC"] = {}
+
+    def _make_token_with_timestamp(self, user, timestamp, secret):
+        mac = self._hmac_template(secret).copy()
+        mac.update(force_bytes(self._make_hash_value(user, timestamp)))
+        # Same truncation as Django: every other hex digit.
+        return "%s-%s" % (int_to_base36(timestamp), mac.hexdigest()[::2])
+
+    def _hmac_template(self, secret) -> "hmac.HMAC":
+        """Return the keyed HMAC for *secret*; never updated, only copied."""
+        template = self._hmac_templates.get(secret)
+        if template is None:
+            hasher = getattr(hashlib, self.algorithm)
+            key = hasher(force_bytes(self.key_salt) + force_bytes(secret)).digest()
+            template = hmac.new(key, digestmod=hasher)
+            self._hmac_templates[secret] = template
+        return template
+
+
+# Module-level singleton — import this in views / services.
+password_reset_token_generator = CachedKeyTokenGenerator()
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from . import views
 
@@ -19,14 +19,11 @@ urlpatterns = [
         views.PasswordResetRequestView.as_view(),
         name="password-reset",
     ),
-    path(
-        "v1/password-reset-confirm/<uidb64>/<token>/",
+    # One route for both forms; the reset email reverses it with
+    # uidb64/token, the frontend posts them in the body.
+    re_path(
+        r"^v1/password-reset-confirm/(?:(?P<uidb64>[^/]+)/(?P<token>[^/]+)/)?$",
         views.PasswordResetConfirmView.as_view(),
         name="password_reset_confirm",
     ),
-    path(
-        "v1/password-reset-confirm/",
-        views.PasswordResetConfirmView.as_view(),
-        name="password_reset_confirm_api",
-    ),
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from rest_framework.generics import (
     ListCreateAPIView,
@@ -15,23 +16,57 @@ from .serializers import (
     PasswordResetSerializer,
     PasswordResetConfirmSerializer,
 )
-from common.pagination import DefaultPagination
+from common.pagination import CachedCountPagination
 from django.conf import settings
+from django.core.cache import cache
 from .permissions import IsAdminOrManager
 from rest_framework.response import Response
 from rest_framework import status
-from django.contrib.auth.tokens import default_token_generator
+from .tokens import password_reset_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 
 logger = logging.getLogger("user_activity")
 
+# Columns the user serializers read or write; the password hash, last_login
+# and permission flags are never loaded for these endpoints.
+USER_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "role",
+    "department",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+# Bumped on every user write; cached list pages embed it in their keys, so a
+# bump orphans them all (they then age out under USER_LIST_CACHE_TTL).
+USER_LIST_VERSION_KEY = "users:list:version"
+
+
+def _user_list_cache_key(request) -> str:
+    version = cache.get_or_set(USER_LIST_VERSION_KEY, 1, timeout=None)
+    path = hashlib.sha1(
+        request.get_full_path().encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"users:list:v{version}:{request.user.pk}:{path}"
+
+
+def invalidate_user_list_cache() -> None:
+    """Make every cached user-list page stale."""
+    try:
+        cache.incr(USER_LIST_VERSION_KEY)
+    except ValueError:
+        # Key missing (evicted or never read) — nothing is cached under it.
+        cache.set(USER_LIST_VERSION_KEY, 1, timeout=None)
 
 
 class UserListCreateView(ListCreateAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.only(*USER_FIELDS).order_by("-created_at")
     serializer_class = UserSerializer
-    pagination_class = DefaultPagination
+    pagination_class = CachedCountPagination
     permission_classes = [IsAuthenticated, IsAdminOrManager]
     ordering = ["-created_at"]
 
@@ -40,20 +75,42 @@ class UserListCreateView(ListCreateAPIView):
             return [AllowAny()]
         return super().get_permissions()
 
+    def list(self, request, *args, **kwargs):
+        # Cache the serialized page per user and URL (page, filters).
+        key = _user_list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.USER_LIST_CACHE_TTL)
+        return response
+
     def perform_create(self, serializer):
         serializer.save()
+        invalidate_user_list_cache()
         ip = get_client_ip(self.request)
-        logger.info(f"New user created: {serializer.instance.email} from IP: {ip}")
+        logger.info(
+            "New user created: %s from IP: %s", serializer.instance.email, ip
+        )
 
 
 class UserDetailView(RetrieveUpdateDestroyAPIView):
-    queryset = User.objects.all()
+    # Saving an instance with deferred fields only writes the loaded ones.
+    queryset = User.objects.only(*USER_FIELDS)
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
             return UserUpdateSerializer
         return UserSerializer
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_user_list_cache()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate_user_list_cache()
+
 class PasswordResetRequestView(CreateAPIView):
     serializer_class = PasswordResetSerializer
     permission_classes = [AllowAny]
@@ -61,31 +118,25 @@ class PasswordResetRequestView(CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)  # ← DRF standard
-        serializer.save(request=request)
+        user = serializer.save(request=request)
         response_data = {"detail": "Password reset email sent."}
-        if settings.DEBUG:
-            email = serializer.validated_data.get("email")
-            if email:
-                try:
-                    user = User.objects.get(email=email)
-                    if user.is_active:
-                        uid = urlsafe_base64_encode(force_bytes(user.pk))
-                        token = default_token_generator.make_token(user)
-                        # Use your actual frontend dev URL, or Django's default
-                        reset_url = (
-                            f"http://127.0.0.1:8000/api/users/v1/"
-                            f"password-reset-confirm/{uid}/{token}/"
-                        )
-                        logger.info(f"[DEV] Password reset link: {reset_url}")
-                        response_data.update(
-                            {
-                                "uid": uid,
-                                "token": token,
-                                "reset_url": reset_url,  # optional, for convenience
-                            }
-                        )
-                except User.DoesNotExist:
-                    pass  # Silent failure — never confirm email existence
+        # Unknown emails fall through silently — never confirm email existence.
+        if settings.DEBUG and user is not None:
+            uid = urlsafe_base64_encode(force_bytes(user.pk))
+            token = password_reset_token_generator.make_token(user)
+            # Use your actual frontend dev URL, or Django's default
+            reset_url = (
+                f"http://127.0.0.1:8000/api/users/v1/"
+                f"password-reset-confirm/{uid}/{token}/"
+            )
+            logger.info("[DEV] Password reset link: %s", reset_url)
+            response_data.update(
+                {
+                    "uid": uid,
+                    "token": token,
+                    "reset_url": reset_url,  # optional, for convenience
+                }
+            )
 
         return Response(response_data, status=status.HTTP_200_OK)
 
@@ -95,7 +146,15 @@ class PasswordResetConfirmView(CreateAPIView):
     permission_classes = [AllowAny]
 
     def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
+        data = (
+            request.data.dict() if hasattr(request.data, "dict") else dict(request.data)
+        )
+        # Link-style requests carry uid/token in the path instead of the body.
+        if kwargs.get("uidb64"):
+            data["uid"] = kwargs["uidb64"]
+        if kwargs.get("token"):
+            data["token"] = kwargs["token"]
+        serializer = self.get_serializer(data=data)
         if serializer.is_valid():
             serializer.save()
             return Response(
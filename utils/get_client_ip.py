@@ -1,6 +1,16 @@
 
+
 def get_client_ip(request):
+    # DRF's Request wraps the HttpRequest; cache on the inner one so views,
+    # serializers and middleware share the parsed value.
+    http_request = getattr(request, "_request", request)
+    ip = getattr(http_request, "_cached_client_ip", None)
+    if ip is not None:
+        return ip
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
     if x_forwarded_for:
-        return x_forwarded_for.split(",")[0].strip()
-    return request.META.get("REMOTE_ADDR")
\ No newline at end of file
+        ip = x_forwarded_for.split(",", 1)[0].strip()
+    else:
+        ip = request.META.get("REMOTE_ADDR")
+    http_request._cached_client_ip = ip
+    return ip